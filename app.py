@@ -11,33 +11,60 @@
 # Start with:
 #   uvicorn app:app --reload
 
+import asyncio
+import hashlib
+import heapq
+import logging
+import threading
+from contextlib import asynccontextmanager
+from itertools import chain
+from operator import itemgetter
+from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 
 from fastapi import FastAPI, HTTPException, Depends, Request, Response  # type: ignore[import]
 from fastapi.middleware.cors import CORSMiddleware  # type: ignore[import]
-from fastapi.responses import FileResponse  # type: ignore[import]
+from fastapi.middleware.gzip import GZipMiddleware  # type: ignore[import]
+from fastapi.responses import FileResponse, JSONResponse  # type: ignore[import]
+import orjson  # type: ignore[import]
 from pydantic import BaseModel  # type: ignore[import]
 
-from config import TEAMS, CURRENT_WEEK, ACTION_MODE  # type: ignore[import]
+from config import get_teams, CURRENT_WEEK, ACTION_MODE  # type: ignore[import]
 from lineup_report import run_lineup_for_team  # type: ignore[import]
-from espn_actions import apply_actions_for_team  # type: ignore[import]
+from espn_actions import (  # type: ignore[import]
+    apply_actions_for_team,
+    build_shared_http_session,
+    dry_run_results,
+)
 from auth_db import (  # type: ignore[import]
     init_db,
     create_user,
     verify_user_credentials,
     get_user_by_id,
+    User,
     set_espn_credentials,
     get_espn_credentials,
     get_managed_team_keys,
     set_managed_team_keys,
 )
-from auth_security import create_session_token, parse_session_token  # type: ignore[import]
+from auth_security import (  # type: ignore[import]
+    create_session_token,
+    parse_session_token,
+)
+from ttl_cache import TTLCache  # type: ignore[import]
+
+log = logging.getLogger(__name__)
 
 
 # ---------------------------------------------------------------------------
-# Pydantic view models
+# View models
 # ---------------------------------------------------------------------------
+#
+# Request bodies are Pydantic models (they need validation). Response shapes
+# are plain frozen dataclasses: handlers return dicts / orjson-serialized
+# payloads, so these only document the schema (and orjson can serialize them
+# natively if one is ever returned directly).
 
 class PlayerRole(str, Enum):
     starter = "starter"
@@ -45,7 +72,8 @@ class PlayerRole(str, Enum):
     stash = "stash"
 
 
-class PlayerView(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class PlayerView:
     name: str
     position: str                 # RB / WR / TE / QB / DST / K
     nfl_team: Optional[str] = None
@@ -55,7 +83,8 @@ class PlayerView(BaseModel):
     status: str                   # ACTIVE / OUT / DOUBTFUL / IR / BYE / etc.
 
 
-class LineupView(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class LineupView:
     team_key: str
     week: int
     total_projection: float
@@ -70,7 +99,8 @@ class ActionType(str, Enum):
     fa_for_bench = "fa_for_bench"
 
 
-class SuggestedAction(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class SuggestedAction:
     id: str                       # e.g. "cant_teach_matchups:fa_for_starter:Jordan Love"
     team_key: str
     week: int
@@ -89,11 +119,15 @@ class SuggestedAction(BaseModel):
     reason: Optional[str] = None  # human-readable explanation
 
 
-class TeamPlan(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class TeamPlan:
     team_key: str
     week: int
     total_projection_optimized: float
     actions: List[SuggestedAction]
+    # Opaque fingerprint of this plan; echo it back on apply / autopilot so
+    # the server can skip recomputing a plan it just handed out.
+    plan_version: Optional[str] = None
 
 
 class ApplyActionsRequest(BaseModel):
@@ -105,9 +139,11 @@ class ApplyActionsRequest(BaseModel):
     does not yet talk back to ESPN.
     """
     action_ids: List[str]
+    plan_version: Optional[str] = None
 
 
-class ApplyActionsResult(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ApplyActionsResult:
     team_key: str
     week: int
     applied: List[SuggestedAction]
@@ -116,7 +152,8 @@ class ApplyActionsResult(BaseModel):
     execution: Optional[List[dict]] = None
 
 
-class UserView(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class UserView:
     id: int
     email: str
 
@@ -136,11 +173,13 @@ class ESPNLinkRequest(BaseModel):
     espn_swid: str
 
 
-class ESPNStatus(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ESPNStatus:
     linked: bool
 
 
-class UserTeam(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class UserTeam:
     key: str
     platform: str
     league_id: int
@@ -154,7 +193,8 @@ class UpdateUserTeamsRequest(BaseModel):
     team_keys: List[str]
 
 
-class WaiverOption(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class WaiverOption:
     add_name: str
     add_position: str
     add_projection: float
@@ -166,7 +206,8 @@ class WaiverOption(BaseModel):
     reason: Optional[str] = None
 
 
-class WaiverPlan(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class WaiverPlan:
     team_key: str
     week: int
     options: List[WaiverOption]
@@ -180,9 +221,11 @@ class AutopilotRequest(BaseModel):
     projected gain meets or exceeds min_gain.
     """
     min_gain: float = 0.5
+    plan_version: Optional[str] = None
 
 
-class AutopilotResult(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AutopilotResult:
     team_key: str
     week: int
     applied: List[SuggestedAction]
@@ -190,56 +233,61 @@ class AutopilotResult(BaseModel):
 
 
 # ---------------------------------------------------------------------------
-# Helper functions to map engine state -> API models
+# Helper functions to map engine state -> JSON-ready dicts
 # ---------------------------------------------------------------------------
+#
+# The hot read endpoints (state / plan / top actions) build plain dicts shaped
+# like the view models above and hand them straight to _OrjsonResponse, so we
+# skip Pydantic validation and jsonable_encoder on every request. The models
+# are still used to document the response schemas in OpenAPI.
 
-def _mk_player_view(p: dict, role: PlayerRole, slot: Optional[str] = None) -> PlayerView:
+def _mk_player_view(p: dict, role: str, slot: Optional[str] = None) -> Dict[str, Any]:
     """
-    Safely convert an internal player dict into a PlayerView.
+    Safely convert an internal player dict into a PlayerView-shaped dict.
+
+    role is the plain PlayerRole value ("starter" / "bench" / "stash"); this
+    runs once per player per request, so we skip enum dispatch here.
     """
     if p is None:
         # Should not happen, but guard anyway.
-        return PlayerView(
-            name="UNKNOWN",
-            position="UNK",
-            nfl_team=None,
-            slot=slot,
-            role=role,
-            projection=0.0,
-            status="UNKNOWN",
-        )
-
-    return PlayerView(
-        name=p.get("name", "UNKNOWN"),
-        position=p.get("position", "UNK"),
-        nfl_team=p.get("nfl_team"),
-        slot=slot,
-        role=role,
-        projection=float(p.get("projection", 0.0)),
-        status=p.get("status", "UNKNOWN"),
-    )
-
-
-def _map_players_for_state(state: dict, team_key: str) -> LineupView:
+        return {
+            "name": "UNKNOWN",
+            "position": "UNK",
+            "nfl_team": None,
+            "slot": slot,
+            "role": role,
+            "projection": 0.0,
+            "status": "UNKNOWN",
+        }
+
+    g = p.get
+    return {
+        "name": g("name", "UNKNOWN"),
+        "position": g("position", "UNK"),
+        "nfl_team": g("nfl_team"),
+        "slot": slot,
+        "role": role,
+        "projection": float(g("projection", 0.0)),
+        "status": g("status", "UNKNOWN"),
+    }
+
+
+def _map_players_for_state(state: dict, team_key: str) -> Dict[str, Any]:
     """
-    Map run_lineup_for_team() output into LineupView for the UI.
+    Map run_lineup_for_team() output into a LineupView-shaped dict for the UI.
     """
-    starters: List[PlayerView] = []
-
-    for s in state.get("current_starters", []):
-        slot_name = s.get("slot_name")
-        p = s.get("player")
-        starters.append(
-            _mk_player_view(p, role=PlayerRole.starter, slot=slot_name)
-        )
+    starters = [
+        _mk_player_view(s.get("player"), "starter", s.get("slot_name"))
+        for s in state.get("current_starters", [])
+    ]
 
     bench_players = [
-        _mk_player_view(p, role=PlayerRole.bench)
+        _mk_player_view(p, "bench")
         for p in state.get("bench", [])
     ]
 
     stash_players = [
-        _mk_player_view(p, role=PlayerRole.stash)
+        _mk_player_view(p, "stash")
         for p in state.get("stash", [])
     ]
 
@@ -247,21 +295,37 @@ def _map_players_for_state(state: dict, team_key: str) -> LineupView:
     # ESPN starters total, not the optimized total.
     total = float(state.get("base_total_projection", state.get("total_projection", 0.0)))
 
-    return LineupView(
-        team_key=team_key,
-        week=CURRENT_WEEK,
-        total_projection=total,
-        starters=starters,
-        bench=bench_players,
-        stash=stash_players,
-    )
+    return {
+        "team_key": team_key,
+        "week": CURRENT_WEEK,
+        "total_projection": total,
+        "starters": starters,
+        "bench": bench_players,
+        "stash": stash_players,
+    }
+
 
+# Middle tokens of the action ids; ids are built with "".join on these.
+_BENCH_TAG = ":bench_to_start:"
+_FA_START_TAG = ":fa_for_starter:"
+_FA_BENCH_TAG = ":fa_for_bench:"
 
-def _actions_from_state(state: dict, team_key: str) -> TeamPlan:
+
+def _iter_raw_actions(
+    state: dict,
+    team_key: str,
+    include_reason: bool = True,
+    bench_only: bool = False,
+) -> Iterator[Dict[str, Any]]:
     """
-    Flatten bench swaps + FA upgrades into a unified list of SuggestedAction.
+    Yield SuggestedAction-shaped dicts for bench swaps + FA upgrades, in
+    engine order (unsorted).
+
+    With include_reason=False the human-readable "reason" string (the biggest
+    per-action allocation) is left out. bench_only=True stops after the
+    bench_to_start swaps, so callers that only want those never build the FA
+    actions.
     """
-    actions: List[SuggestedAction] = []
     week = CURRENT_WEEK
 
     # 1) Bench ↔ starter swaps (low risk)
@@ -273,24 +337,28 @@ def _actions_from_state(state: dict, team_key: str) -> TeamPlan:
         if not bench_p or not starter_p:
             continue
 
-        actions.append(
-            SuggestedAction(
-                id=f"{team_key}:bench_to_start:{bench_p.get('name','UNKNOWN')}",
-                team_key=team_key,
-                week=week,
-                type=ActionType.bench_to_start,
-                add_name=bench_p.get("name", "UNKNOWN"),
-                add_position=bench_p.get("position", "UNK"),
-                add_projection=float(bench_p.get("projection", 0.0)),
-                drop_name=starter_p.get("name", "UNKNOWN"),
-                drop_position=starter_p.get("position", "UNK"),
-                drop_projection=float(starter_p.get("projection", 0.0)),
-                gain=gain,
-                can_add_now=True,
-                reason=f"Bench {starter_p.get('name','UNKNOWN')} for "
-                       f"{bench_p.get('name','UNKNOWN')} (+{gain:.1f} pts)",
-            )
-        )
+        add_name = bench_p.get("name", "UNKNOWN")
+        drop_name = starter_p.get("name", "UNKNOWN")
+        action = {
+            "id": "".join((team_key, _BENCH_TAG, add_name)),
+            "team_key": team_key,
+            "week": week,
+            "type": "bench_to_start",
+            "add_name": add_name,
+            "add_position": bench_p.get("position", "UNK"),
+            "add_projection": float(bench_p.get("projection", 0.0)),
+            "drop_name": drop_name,
+            "drop_position": starter_p.get("position", "UNK"),
+            "drop_projection": float(starter_p.get("projection", 0.0)),
+            "gain": gain,
+            "can_add_now": True,
+        }
+        if include_reason:
+            action["reason"] = f"Bench {drop_name} for {add_name} (+{gain:.1f} pts)"
+        yield action
+
+    if bench_only:
+        return
 
     # 2) Free agents who would start
     for fa in state.get("fa_starter_upgrades", []):
@@ -302,24 +370,27 @@ def _actions_from_state(state: dict, team_key: str) -> TeamPlan:
         if not fa_p or not bumped:
             continue
 
-        actions.append(
-            SuggestedAction(
-                id=f"{team_key}:fa_for_starter:{fa_p.get('name','UNKNOWN')}",
-                team_key=team_key,
-                week=week,
-                type=ActionType.fa_for_starter,
-                add_name=fa_p.get("name", "UNKNOWN"),
-                add_position=fa_p.get("position", "UNK"),
-                add_projection=float(fa_p.get("projection", 0.0)),
-                drop_name=bumped.get("name", "UNKNOWN"),
-                drop_position=bumped.get("position", "UNK"),
-                drop_projection=float(bumped.get("projection", 0.0)),
-                gain=gain,
-                can_add_now=can_add_now,
-                reason=f"Add {fa_p.get('name','UNKNOWN')} to start over "
-                       f"{bumped.get('name','UNKNOWN')} (+{gain:.1f} pts)",
+        add_name = fa_p.get("name", "UNKNOWN")
+        drop_name = bumped.get("name", "UNKNOWN")
+        action = {
+            "id": "".join((team_key, _FA_START_TAG, add_name)),
+            "team_key": team_key,
+            "week": week,
+            "type": "fa_for_starter",
+            "add_name": add_name,
+            "add_position": fa_p.get("position", "UNK"),
+            "add_projection": float(fa_p.get("projection", 0.0)),
+            "drop_name": drop_name,
+            "drop_position": bumped.get("position", "UNK"),
+            "drop_projection": float(bumped.get("projection", 0.0)),
+            "gain": gain,
+            "can_add_now": can_add_now,
+        }
+        if include_reason:
+            action["reason"] = (
+                f"Add {add_name} to start over {drop_name} (+{gain:.1f} pts)"
             )
-        )
+        yield action
 
     # 3) Free agents who are better bench stashes
     for fa in state.get("fa_bench_upgrades", []):
@@ -331,52 +402,82 @@ def _actions_from_state(state: dict, team_key: str) -> TeamPlan:
         if not fa_p or not drop:
             continue
 
-        actions.append(
-            SuggestedAction(
-                id=f"{team_key}:fa_for_bench:{fa_p.get('name','UNKNOWN')}",
-                team_key=team_key,
-                week=week,
-                type=ActionType.fa_for_bench,
-                add_name=fa_p.get("name", "UNKNOWN"),
-                add_position=fa_p.get("position", "UNK"),
-                add_projection=float(fa_p.get("projection", 0.0)),
-                drop_name=drop.get("name", "UNKNOWN"),
-                drop_position=drop.get("position", "UNK"),
-                drop_projection=float(drop.get("projection", 0.0)),
-                gain=gain,
-                can_add_now=can_add_now,
-                reason=f"Bench upgrade: {fa_p.get('name','UNKNOWN')} > "
-                       f"{drop.get('name','UNKNOWN')} (+{gain:.1f} pts)",
+        add_name = fa_p.get("name", "UNKNOWN")
+        drop_name = drop.get("name", "UNKNOWN")
+        action = {
+            "id": "".join((team_key, _FA_BENCH_TAG, add_name)),
+            "team_key": team_key,
+            "week": week,
+            "type": "fa_for_bench",
+            "add_name": add_name,
+            "add_position": fa_p.get("position", "UNK"),
+            "add_projection": float(fa_p.get("projection", 0.0)),
+            "drop_name": drop_name,
+            "drop_position": drop.get("position", "UNK"),
+            "drop_projection": float(drop.get("projection", 0.0)),
+            "gain": gain,
+            "can_add_now": can_add_now,
+        }
+        if include_reason:
+            action["reason"] = (
+                f"Bench upgrade: {add_name} > {drop_name} (+{gain:.1f} pts)"
             )
-        )
+        yield action
 
-    # Sort by biggest gain first
-    actions.sort(key=lambda a: a.gain, reverse=True)
 
-    return TeamPlan(
-        team_key=team_key,
-        week=week,
-        total_projection_optimized=float(
+def _finalize_plan(
+    state: dict, team_key: str, actions: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Wrap action dicts (sorted by biggest gain first, in place) into a
+    TeamPlan-shaped dict.
+    """
+    actions.sort(key=itemgetter("gain"), reverse=True)
+
+    return {
+        "team_key": team_key,
+        "week": CURRENT_WEEK,
+        "total_projection_optimized": float(
             state.get("optimized_total_projection", 0.0)
         ),
-        actions=actions,
+        "actions": actions,
+    }
+
+
+def _actions_from_state(
+    state: dict, team_key: str, include_reason: bool = True
+) -> Dict[str, Any]:
+    """
+    Flatten bench swaps + FA upgrades into a TeamPlan-shaped dict whose
+    "actions" are SuggestedAction-shaped dicts.
+    """
+    return _finalize_plan(
+        state, team_key, list(_iter_raw_actions(state, team_key, include_reason))
     )
 
 
-def _waiver_plan_from_state(state: dict, team_key: str) -> WaiverPlan:
+def _waiver_plan_from_state(state: dict, team_key: str) -> Dict[str, Any]:
     """
     Build a simple waiver "plan" from the engine state.
 
     For now we treat any FA → bench upgrade with can_add_now=False as a yellow
     waiver candidate. For each droppable bench player we keep the top few
     upgrade options ordered by gain.
+
+    Like the other plan helpers this returns a WaiverPlan-shaped dict rather
+    than Pydantic models.
     """
     week = CURRENT_WEEK
     raw_options = state.get("fa_bench_upgrades", [])
 
-    by_drop: dict[str, List[WaiverOption]] = {}
+    # For each drop player, keep the top few options. Each bucket is a
+    # bounded min-heap of (gain, -seq, option) so long waiver lists cost
+    # O(M log K) instead of a full sort per bucket; -seq keeps the earlier
+    # option on equal gains.
+    MAX_PER_DROP = 3
+    by_drop: Dict[str, List[tuple]] = {}
 
-    for fa in raw_options:
+    for seq, fa in enumerate(raw_options):
         fa_p = fa.get("fa")
         drop = fa.get("drop")
         gain = float(fa.get("gain", 0.0))
@@ -388,41 +489,92 @@ def _waiver_plan_from_state(state: dict, team_key: str) -> WaiverPlan:
         if not fa_p or not drop:
             continue
 
-        option = WaiverOption(
-            add_name=fa_p.get("name", "UNKNOWN"),
-            add_position=fa_p.get("position", "UNK"),
-            add_projection=float(fa_p.get("projection", 0.0)),
-            drop_name=drop.get("name", "UNKNOWN"),
-            drop_position=drop.get("position", "UNK"),
-            drop_projection=float(drop.get("projection", 0.0)),
-            gain=gain,
-            can_add_now=can_add_now,
-            reason=f"Waiver: {fa_p.get('name','UNKNOWN')} > "
-                   f"{drop.get('name','UNKNOWN')} (+{gain:.1f} pts)",
-        )
-
-        key = option.drop_name
-        bucket = by_drop.setdefault(key, [])
-        bucket.append(option)
+        option = {
+            "add_name": fa_p.get("name", "UNKNOWN"),
+            "add_position": fa_p.get("position", "UNK"),
+            "add_projection": float(fa_p.get("projection", 0.0)),
+            "drop_name": drop.get("name", "UNKNOWN"),
+            "drop_position": drop.get("position", "UNK"),
+            "drop_projection": float(drop.get("projection", 0.0)),
+            "gain": gain,
+            "can_add_now": can_add_now,
+            "reason": f"Waiver: {fa_p.get('name','UNKNOWN')} > "
+                      f"{drop.get('name','UNKNOWN')} (+{gain:.1f} pts)",
+        }
+
+        bucket = by_drop.setdefault(option["drop_name"], [])
+        entry = (gain, -seq, option)
+        if len(bucket) < MAX_PER_DROP:
+            heapq.heappush(bucket, entry)
+        else:
+            heapq.heappushpop(bucket, entry)
 
-    # For each drop player, keep the top few options.
-    MAX_PER_DROP = 3
-    options: List[WaiverOption] = []
+    options: List[Dict[str, Any]] = []
     for bucket in by_drop.values():
-        bucket.sort(key=lambda o: o.gain, reverse=True)
-        options.extend(bucket[:MAX_PER_DROP])
+        bucket.sort(key=lambda e: (e[0], e[1]), reverse=True)
+        options.extend(e[2] for e in bucket)
 
     # Sort overall by gain descending.
-    options.sort(key=lambda o: o.gain, reverse=True)
+    options.sort(key=lambda o: o["gain"], reverse=True)
 
-    return WaiverPlan(team_key=team_key, week=week, options=options)
+    return {"team_key": team_key, "week": week, "options": options}
 
 
 # ---------------------------------------------------------------------------
 # FastAPI app + routes
 # ---------------------------------------------------------------------------
 
-app = FastAPI(title="LineupIQ API")
+# TEAMS is static config, so the public per-team JSON shape (used by /teams and
+# /me/teams) is built once at import instead of on every request.
+_TEAMS_JSON: Dict[str, Dict[str, Any]] = {
+    key: {
+        "key": key,
+        "platform": cfg["platform"],
+        "league_id": cfg["league_id"],
+        "season_year": cfg["season_year"],
+        "team_name_keyword": cfg["team_name_keyword"],
+        "scoring": cfg["scoring"],
+    }
+    for key, cfg in get_teams().items()
+}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Ensure the auth database / tables exist.
+    init_db()
+    # One pooled HTTP session for ESPN writes, shared by every request.
+    app.state.http = build_shared_http_session()
+    try:
+        yield
+    finally:
+        app.state.http.close()
+
+
+class _OrjsonResponse(JSONResponse):
+    """
+    JSON response rendered with orjson. Same output as fastapi's
+    ORJSONResponse, which is deprecated in current FastAPI.
+
+    Handlers that return one of these directly skip FastAPI's
+    jsonable_encoder pass; a plain dict return would still go through it.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+app = FastAPI(
+    title="LineupIQ API",
+    default_response_class=_OrjsonResponse,
+    lifespan=lifespan,
+)
+
+# Compress larger JSON payloads (plans / top actions repeat the same field
+# names per action, so gzip shrinks them several-fold). Tiny responses such as
+# /health are sent as-is.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # Optional: allow local dev frontends (Next.js, iOS simulator via local proxy, etc.)
 app.add_middleware(
@@ -434,14 +586,8 @@ app.add_middleware(
 )
 
 
-@app.on_event("startup")
-def _on_startup():
-    # Ensure the auth database / tables exist.
-    init_db()
-
-
-def _user_from_dict(row: dict) -> UserView:
-    return UserView(id=int(row["id"]), email=row["email"])
+def _user_from_row(row: User) -> UserView:
+    return UserView(id=int(row.id), email=row.email)
 
 
 def get_current_user(request: Request) -> UserView:
@@ -454,31 +600,180 @@ def get_current_user(request: Request) -> UserView:
     row = get_user_by_id(user_id)
     if not row:
         raise HTTPException(status_code=401, detail="User not found")
-    return _user_from_dict(row)
 
+    # Per-request memo: anything else in this request that needs the user row,
+    # their ESPN cookies or a team config reads it from request.state instead
+    # of SQLite.
+    request.state.user_row = row
+    request.state.espn_creds = _CREDS_UNSET
+    request.state.team_cfgs = {}
+    return _user_from_row(row)
+
+
+# Sentinel for "ESPN credentials not looked up yet in this request" (None
+# means "looked up, not linked").
+_CREDS_UNSET = object()
 
-def _team_cfg_for_user(team_key: str, user: UserView) -> Dict[str, Any]:
+
+def _espn_creds_for_request(request: Request):
+    """
+    Return (espn_s2, espn_swid) for the authenticated user, or None if they
+    have not linked ESPN. Looked up at most once per request.
     """
-    Build a per-request team config for the given user.
+    creds = getattr(request.state, "espn_creds", _CREDS_UNSET)
+    if creds is _CREDS_UNSET:
+        creds = get_espn_credentials(int(request.state.user_row.id))
+        request.state.espn_creds = creds
+    return creds
+
+
+def _team_cfg_for_user(team_key: str, request: Request) -> Dict[str, Any]:
+    """
+    Build a per-request team config for the authenticated user.
 
     We start from the static TEAMS config for league_id / season_year / scoring,
     but inject this user's ESPN cookies so each user talks to their own ESPN
-    account.
+    account. Configs are built once per team per request and kept in
+    request.state.team_cfgs.
     """
-    if team_key not in TEAMS:
+    if team_key not in get_teams():
         raise HTTPException(status_code=404, detail="Unknown team_key")
 
-    base = dict(TEAMS[team_key])
-    creds = get_espn_credentials(user.id)
+    team_cfgs = request.state.team_cfgs
+    cfg = team_cfgs.get(team_key)
+    if cfg is not None:
+        return cfg
+
+    creds = _espn_creds_for_request(request)
     if not creds:
         raise HTTPException(
             status_code=400,
             detail="ESPN account not linked for this user. Call /auth/espn_link first.",
         )
     espn_s2, espn_swid = creds
-    base["espn_s2"] = espn_s2
-    base["espn_swid"] = espn_swid
-    return base
+    cfg = {
+        **get_teams()[team_key],
+        "espn_s2": espn_s2,
+        "espn_swid": espn_swid,
+        # Shared keep-alive session for ESPN writes (see lifespan).
+        "http_session": getattr(request.app.state, "http", None),
+    }
+    team_cfgs[team_key] = cfg
+    return cfg
+
+
+# ---------------------------------------------------------------------------
+# Short-lived engine result cache
+# ---------------------------------------------------------------------------
+#
+# run_lineup_for_team() (ESPN fetch + optimizer) dominates request latency, and
+# the UI typically hits state -> plan -> apply for the same team within a few
+# seconds. Cache the engine state per (user, team, week) for a short TTL so
+# those follow-up calls reuse one engine run. A per-key lock makes concurrent
+# misses wait for the first computation instead of all hitting ESPN.
+#
+# This is an in-process cache; a multi-worker deployment would need a shared
+# store (e.g. Redis) instead.
+
+LINEUP_CACHE_TTL_SECONDS = 20.0
+
+_lineup_cache = TTLCache(maxsize=1024, ttl=LINEUP_CACHE_TTL_SECONDS)
+# Per-key [lock, users] for in-flight computations; an entry is dropped as
+# soon as nobody is computing or waiting on that key.
+_lineup_cache_locks: Dict[tuple, list] = {}
+_lineup_cache_guard = threading.Lock()
+
+
+def _cached_run_lineup(user_id: int, team_key: str, team_cfg: Dict[str, Any]) -> dict:
+    """
+    Return run_lineup_for_team() output, reusing a recent result for the same
+    (user, team, week) when it is younger than LINEUP_CACHE_TTL_SECONDS.
+    """
+    key = (user_id, team_key, CURRENT_WEEK)
+
+    state = _lineup_cache.get(key)
+    if state is not None:
+        return state
+
+    with _lineup_cache_guard:
+        entry = _lineup_cache_locks.get(key)
+        if entry is None:
+            entry = _lineup_cache_locks[key] = [threading.Lock(), 0]
+        entry[1] += 1
+
+    try:
+        with entry[0]:
+            # Another request may have filled the cache while we were waiting.
+            state = _lineup_cache.get(key)
+            if state is not None:
+                return state
+
+            state = run_lineup_for_team(team_key, team_cfg_override=team_cfg)
+            _lineup_cache.set(key, state)
+            return state
+    finally:
+        with _lineup_cache_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _lineup_cache_locks[key]
+
+
+def _invalidate_lineup_cache(user_id: int, team_key: str) -> None:
+    """
+    Drop the cached engine state for a team, e.g. after changing it on ESPN.
+    """
+    _lineup_cache.pop((user_id, team_key, CURRENT_WEEK), None)
+
+
+# Last plan handed out per (user, team): (plan_version, plan).
+# When apply / autopilot echo a matching plan_version within
+# PLAN_REUSE_SECONDS we act on that exact plan without touching the engine.
+PLAN_REUSE_SECONDS = 30.0
+
+_LAST_PLAN = TTLCache(maxsize=1024, ttl=PLAN_REUSE_SECONDS)
+
+
+def _reusable_plan(
+    user_id: int, team_key: str, plan_version: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """
+    The last plan served for (user, team) if it matches plan_version and is
+    younger than PLAN_REUSE_SECONDS, else None.
+    """
+    if not plan_version:
+        return None
+    last = _LAST_PLAN.get((user_id, team_key))
+    if last is not None and last[0] == plan_version:
+        return last[1]
+    return None
+
+
+def _plan_for_user_team(
+    user_id: int,
+    team_key: str,
+    team_cfg: Dict[str, Any],
+    plan_version: Optional[str] = None,
+    include_reason: bool = True,
+) -> Dict[str, Any]:
+    """
+    Return the TeamPlan-shaped dict for a team, tagged with its plan_version.
+
+    If the caller passes the plan_version of a plan we served in the last
+    PLAN_REUSE_SECONDS, that plan is returned as-is.
+    """
+    reused = _reusable_plan(user_id, team_key, plan_version)
+    if reused is not None:
+        return reused
+
+    key = (user_id, team_key)
+    state = _cached_run_lineup(user_id, team_key, team_cfg)
+    plan = _actions_from_state(state, team_key, include_reason)
+    version = hashlib.blake2b(
+        orjson.dumps(plan["actions"]), digest_size=8
+    ).hexdigest()
+    plan["plan_version"] = version
+    _LAST_PLAN.set(key, (version, plan))
+    return plan
 
 
 @app.get("/")
@@ -500,7 +795,6 @@ def serve_ui_root():
 
 @app.post("/auth/register", response_model=UserView)
 def register(req: RegisterRequest):
-    existing = verify_user_credentials(req.email, req.password)
     # We don't want to leak whether the email exists; instead, try to create
     # and handle uniqueness errors gracefully.
     from sqlite3 import IntegrityError
@@ -512,7 +806,7 @@ def register(req: RegisterRequest):
         raise HTTPException(status_code=400, detail="Email already registered")
     row = get_user_by_id(user_id)
     assert row is not None
-    return _user_from_dict(row)
+    return _user_from_row(row)
 
 
 @app.post("/auth/login", response_model=UserView)
@@ -521,7 +815,7 @@ def login(req: LoginRequest, response: Response):
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    token = create_session_token(int(user["id"]))
+    token = create_session_token(int(user.id))
     # HttpOnly cookie; in production you should also set secure=True and a
     # proper domain.
     response.set_cookie(
@@ -530,7 +824,7 @@ def login(req: LoginRequest, response: Response):
         httponly=True,
         samesite="lax",
     )
-    return _user_from_dict(user)
+    return _user_from_row(user)
 
 
 @app.post("/auth/logout")
@@ -557,43 +851,51 @@ def link_espn(req: ESPNLinkRequest, user: UserView = Depends(get_current_user)):
 
 
 @app.get("/auth/espn_status", response_model=ESPNStatus)
-def espn_status(user: UserView = Depends(get_current_user)):
+def espn_status(request: Request, user: UserView = Depends(get_current_user)):
     """
     Simple status endpoint so the UI can tell whether ESPN cookies are linked.
     """
-    creds = get_espn_credentials(user.id)
+    creds = _espn_creds_for_request(request)
     return ESPNStatus(linked=creds is not None)
 
 
-@app.get("/me/teams", response_model=List[UserTeam])
-def get_user_teams(user: UserView = Depends(get_current_user)):
+def _json_with_etag(request: Request, content: Any) -> Response:
     """
-    Return all configured teams with an 'enabled' flag for this user.
-
-    If the user has never configured teams, all TEAMS are treated as enabled.
+    Serialize content once, tag it with an ETag derived from the body, and
+    answer 304 Not Modified if the client already holds that version.
     """
-    managed = set(get_managed_team_keys(user.id))
+    body = orjson.dumps(content)
+    etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    headers = {"ETag": etag}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (t.strip() for t in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _user_teams_payload(user_id: int) -> List[Dict[str, Any]]:
+    managed = set(get_managed_team_keys(user_id))
     # If no explicit configuration, treat all as enabled.
     use_all = not managed
 
-    teams: List[UserTeam] = []
-    for key, cfg in TEAMS.items():
-        enabled = use_all or key in managed
-        teams.append(
-            UserTeam(
-                key=key,
-                platform=cfg["platform"],
-                league_id=cfg["league_id"],
-                season_year=cfg["season_year"],
-                team_name_keyword=cfg["team_name_keyword"],
-                scoring=cfg["scoring"],
-                enabled=enabled,
-            )
-        )
-    return teams
+    return [
+        {**team, "enabled": use_all or key in managed}
+        for key, team in _TEAMS_JSON.items()
+    ]
 
 
-@app.post("/me/teams", response_model=List[UserTeam])
+@app.get("/me/teams", responses={200: {"model": List[UserTeam]}})
+def get_user_teams(request: Request, user: UserView = Depends(get_current_user)):
+    """
+    Return all configured teams with an 'enabled' flag for this user.
+
+    If the user has never configured teams, all TEAMS are treated as enabled.
+    Supports If-None-Match / 304 since this only changes via POST /me/teams.
+    """
+    return _json_with_etag(request, _user_teams_payload(user.id))
+
+
+@app.post("/me/teams", responses={200: {"model": List[UserTeam]}})
 def update_user_teams(
     req: UpdateUserTeamsRequest, user: UserView = Depends(get_current_user)
 ):
@@ -601,76 +903,88 @@ def update_user_teams(
     Set which TEAMS entries this user wants LineupIQ to manage.
     """
     # Filter to known team keys only.
-    cleaned = [key for key in req.team_keys if key in TEAMS]
+    teams = get_teams()
+    cleaned = [key for key in req.team_keys if key in teams]
     set_managed_team_keys(user.id, cleaned)
-    return get_user_teams(user)
+    return _user_teams_payload(user.id)
+
+
+# /health is constant for the life of the process, so its ETag is too.
+_HEALTH_ETAG = f'"lineupiq-ok-w{CURRENT_WEEK}"'
 
 
 @app.get("/health")
-def health():
-    return {"status": "ok", "week": CURRENT_WEEK}
+def health(request: Request):
+    headers = {"ETag": _HEALTH_ETAG, "X-LineupIQ-Week": str(CURRENT_WEEK)}
+    if request.headers.get("if-none-match") == _HEALTH_ETAG:
+        return Response(status_code=304, headers=headers)
+    return _OrjsonResponse({"status": "ok", "week": CURRENT_WEEK}, headers=headers)
 
 
 @app.get("/teams")
-def list_teams(user: UserView = Depends(get_current_user)):
+def list_teams(request: Request, user: UserView = Depends(get_current_user)):
     """
     List of all configured teams. Drives the 'all my teams' view.
     """
     managed = set(get_managed_team_keys(user.id))
-    results = []
-    for key, cfg in TEAMS.items():
-        # If the user has explicitly configured teams, only show those.
-        if managed and key not in managed:
-            continue
-        results.append(
-            {
-                "key": key,
-                "platform": cfg["platform"],
-                "league_id": cfg["league_id"],
-                "season_year": cfg["season_year"],
-                "team_name_keyword": cfg["team_name_keyword"],
-                "scoring": cfg["scoring"],
-            }
-        )
-    return results
+    # If the user has explicitly configured teams, only show those.
+    if not managed:
+        teams = list(_TEAMS_JSON.values())
+    else:
+        teams = [team for key, team in _TEAMS_JSON.items() if key in managed]
+    return _json_with_etag(request, teams)
 
 
-@app.get("/teams/{team_key}/state", response_model=LineupView)
-def get_team_state(team_key: str, user: UserView = Depends(get_current_user)):
+@app.get("/teams/{team_key}/state", responses={200: {"model": LineupView}})
+async def get_team_state(
+    team_key: str, request: Request, user: UserView = Depends(get_current_user)
+):
     """
     Current starters / bench / stash for one team (with optimized total).
     """
-    team_cfg = _team_cfg_for_user(team_key, user)
-    state = run_lineup_for_team(team_key, team_cfg_override=team_cfg)
-    return _map_players_for_state(state, team_key)
+    team_cfg = _team_cfg_for_user(team_key, request)
+    state = await asyncio.to_thread(_cached_run_lineup, user.id, team_key, team_cfg)
+    return _OrjsonResponse(_map_players_for_state(state, team_key))
 
 
-@app.get("/teams/{team_key}/plan", response_model=TeamPlan)
-def get_team_plan(team_key: str, user: UserView = Depends(get_current_user)):
+@app.get("/teams/{team_key}/plan", responses={200: {"model": TeamPlan}})
+async def get_team_plan(
+    team_key: str,
+    request: Request,
+    include_reason: bool = True,
+    user: UserView = Depends(get_current_user),
+):
     """
     Canonical list of suggested actions for this team.
+
+    Pass ?include_reason=false to omit the human-readable reason strings.
     """
-    team_cfg = _team_cfg_for_user(team_key, user)
-    state = run_lineup_for_team(team_key, team_cfg_override=team_cfg)
-    return _actions_from_state(state, team_key)
+    team_cfg = _team_cfg_for_user(team_key, request)
+    plan = await asyncio.to_thread(
+        _plan_for_user_team, user.id, team_key, team_cfg, include_reason=include_reason
+    )
+    return _OrjsonResponse(plan)
 
 
-@app.get("/teams/{team_key}/waiver_plan", response_model=WaiverPlan)
-def get_waiver_plan(team_key: str, user: UserView = Depends(get_current_user)):
+@app.get("/teams/{team_key}/waiver_plan", responses={200: {"model": WaiverPlan}})
+async def get_waiver_plan(
+    team_key: str, request: Request, user: UserView = Depends(get_current_user)
+):
     """
     Waiver (yellow FA) recommendation plan for a team.
 
     This is intentionally read-only and only surfaces suggestions for
     can_add_now=False free agents; you still place the actual claims in ESPN.
     """
-    team_cfg = _team_cfg_for_user(team_key, user)
-    state = run_lineup_for_team(team_key, team_cfg_override=team_cfg)
-    return _waiver_plan_from_state(state, team_key)
+    team_cfg = _team_cfg_for_user(team_key, request)
+    state = await asyncio.to_thread(_cached_run_lineup, user.id, team_key, team_cfg)
+    return _OrjsonResponse(_waiver_plan_from_state(state, team_key))
 
 
 @app.post("/teams/{team_key}/actions/apply", response_model=ApplyActionsResult)
-def apply_actions_dry_run(
+async def apply_actions_dry_run(
     team_key: str,
+    request: Request,
     req: ApplyActionsRequest,
     mode: Optional[str] = None,
     user: UserView = Depends(get_current_user),
@@ -678,20 +992,22 @@ def apply_actions_dry_run(
     """
     Dry-run endpoint for applying suggested actions.
 
-    - Recomputes the latest plan for the team.
+    - Recomputes the latest plan for the team (or reuses the one identified
+      by plan_version if it was served in the last PLAN_REUSE_SECONDS).
     - Resolves the requested action_ids against that plan.
     - Returns the matching SuggestedAction objects and any unknown IDs.
 
     IMPORTANT: This does *not* mutate your ESPN lineup yet. It's only here
     to wire up the UI flow and inspect what would be done.
     """
-    team_cfg = _team_cfg_for_user(team_key, user)
-    state = run_lineup_for_team(team_key, team_cfg_override=team_cfg)
-    plan = _actions_from_state(state, team_key)
+    team_cfg = _team_cfg_for_user(team_key, request)
+    plan = await asyncio.to_thread(
+        _plan_for_user_team, user.id, team_key, team_cfg, req.plan_version
+    )
 
-    by_id = {a.id: a for a in plan.actions}
+    by_id = {a["id"]: a for a in plan["actions"]}
 
-    applied: List[SuggestedAction] = []
+    applied: List[Dict[str, Any]] = []
     unknown: List[str] = []
 
     for action_id in req.action_ids:
@@ -701,32 +1017,44 @@ def apply_actions_dry_run(
         else:
             unknown.append(action_id)
 
-    # Abstracted execution layer. We pass simple dicts so espn_actions stays
-    # decoupled from FastAPI / Pydantic types.
+    # Abstracted execution layer. The plan actions are already plain dicts, so
+    # they go to espn_actions as-is.
 
     # Allow per-request override of execution mode via ?mode=dry_run|http.
     exec_mode = (mode or ACTION_MODE).lower()
     if exec_mode not in ("dry_run", "http"):
         exec_mode = ACTION_MODE
 
-    execution = apply_actions_for_team(
-        team_cfg=team_cfg,
-        actions=[a.dict() for a in applied],
-        mode=exec_mode,
-    )
-
-    return ApplyActionsResult(
-        team_key=team_key,
-        week=CURRENT_WEEK,
-        applied=applied,
-        unknown_action_ids=unknown,
-        execution=execution,
+    if exec_mode == "dry_run":
+        # Nothing is sent to ESPN; describe the actions directly.
+        execution = dry_run_results(team_cfg, applied)
+    else:
+        execution = await asyncio.to_thread(
+            apply_actions_for_team,
+            team_cfg=team_cfg,
+            actions=applied,
+            mode=exec_mode,
+        )
+    if exec_mode == "http":
+        # The roster on ESPN has (potentially) changed; recompute next time.
+        _invalidate_lineup_cache(user.id, team_key)
+        _LAST_PLAN.pop((user.id, team_key), None)
+
+    return _OrjsonResponse(
+        content={
+            "team_key": team_key,
+            "week": CURRENT_WEEK,
+            "applied": applied,
+            "unknown_action_ids": unknown,
+            "execution": execution,
+        }
     )
 
 
 @app.post("/teams/{team_key}/autopilot", response_model=AutopilotResult)
-def autopilot_swaps(
+async def autopilot_swaps(
     team_key: str,
+    request: Request,
     req: AutopilotRequest,
     mode: Optional[str] = None,
     user: UserView = Depends(get_current_user),
@@ -734,58 +1062,111 @@ def autopilot_swaps(
     """
     Autopilot endpoint: apply a set of bench_to_start swaps for this team.
 
-    - Recomputes the latest plan for the team.
+    - Recomputes the latest plan for the team (or reuses the one identified
+      by plan_version if it was served in the last PLAN_REUSE_SECONDS).
     - Filters to bench_to_start actions with gain >= min_gain.
     - Applies those actions via espn_actions.apply_actions_for_team.
     """
-    team_cfg = _team_cfg_for_user(team_key, user)
-    state = run_lineup_for_team(team_key, team_cfg_override=team_cfg)
-    plan = _actions_from_state(state, team_key)
-
-    # Only Bench → Start actions, filtered by gain.
-    candidates: List[SuggestedAction] = [
-        a for a in plan.actions
-        if a.type == ActionType.bench_to_start and a.gain >= req.min_gain
-    ]
+    team_cfg = _team_cfg_for_user(team_key, request)
+
+    # Only Bench → Start actions, filtered by gain. Without a fresh plan to
+    # reuse, filter straight off the engine state so FA actions are never
+    # built.
+    candidates: List[Dict[str, Any]]
+    plan = _reusable_plan(user.id, team_key, req.plan_version)
+    if plan is not None:
+        candidates = [
+            a for a in plan["actions"]
+            if a["type"] == "bench_to_start" and a["gain"] >= req.min_gain
+        ]
+    else:
+        state = await asyncio.to_thread(
+            _cached_run_lineup, user.id, team_key, team_cfg
+        )
+        candidates = [
+            a for a in _iter_raw_actions(state, team_key, bench_only=True)
+            if a["gain"] >= req.min_gain
+        ]
+        candidates.sort(key=itemgetter("gain"), reverse=True)
 
     if not candidates:
-        return AutopilotResult(
-            team_key=team_key,
-            week=CURRENT_WEEK,
-            applied=[],
-            execution=[],
+        return _OrjsonResponse(
+            content={
+                "team_key": team_key,
+                "week": CURRENT_WEEK,
+                "applied": [],
+                "execution": [],
+            }
         )
 
     exec_mode = (mode or ACTION_MODE).lower()
     if exec_mode not in ("dry_run", "http"):
         exec_mode = ACTION_MODE
 
-    execution = apply_actions_for_team(
-        team_cfg=team_cfg,
-        actions=[a.dict() for a in candidates],
-        mode=exec_mode,
-    )
-
-    return AutopilotResult(
-        team_key=team_key,
-        week=CURRENT_WEEK,
-        applied=candidates,
-        execution=execution,
+    if exec_mode == "dry_run":
+        # Nothing is sent to ESPN; describe the actions directly.
+        execution = dry_run_results(team_cfg, candidates)
+    else:
+        execution = await asyncio.to_thread(
+            apply_actions_for_team,
+            team_cfg=team_cfg,
+            actions=candidates,
+            mode=exec_mode,
+        )
+    if exec_mode == "http":
+        _invalidate_lineup_cache(user.id, team_key)
+        _LAST_PLAN.pop((user.id, team_key), None)
+
+    return _OrjsonResponse(
+        content={
+            "team_key": team_key,
+            "week": CURRENT_WEEK,
+            "applied": candidates,
+            "execution": execution,
+        }
     )
 
 
-@app.get("/actions/top", response_model=List[SuggestedAction])
-def get_top_actions(limit: int = 20, user: UserView = Depends(get_current_user)):
+@app.get("/actions/top", responses={200: {"model": List[SuggestedAction]}})
+async def get_top_actions(
+    request: Request,
+    limit: int = 20,
+    include_reason: bool = True,
+    user: UserView = Depends(get_current_user),
+):
     """
     Cross-team 'top actions this week' view.
+
+    Each team's engine run is mostly ESPN round-trips, so we fan the teams out
+    onto worker threads and gather them concurrently instead of paying the
+    latency once per team. A team whose run fails is logged and skipped so
+    one bad league doesn't take down the whole view.
     """
-    all_actions: List[SuggestedAction] = []
+    # Resolve configs up front so auth / linking errors still surface as-is
+    # (the ESPN cookies are read from SQLite once and reused for every team).
+    team_cfgs = {
+        team_key: _team_cfg_for_user(team_key, request) for team_key in _TEAMS_JSON
+    }
+
+    def _plan_for_team(team_key: str) -> Dict[str, Any]:
+        state = _cached_run_lineup(user.id, team_key, team_cfgs[team_key])
+        return _actions_from_state(state, team_key, include_reason)
+
+    results = await asyncio.gather(
+        *(asyncio.to_thread(_plan_for_team, team_key) for team_key in team_cfgs),
+        return_exceptions=True,
+    )
 
-    for team_key in TEAMS.keys():
-        team_cfg = _team_cfg_for_user(team_key, user)
-        state = run_lineup_for_team(team_key, team_cfg_override=team_cfg)
-        plan = _actions_from_state(state, team_key)
-        all_actions.extend(plan.actions)
+    # Each team's actions are already sorted by gain, so only its first
+    # `limit` can make the cut; merge those with a bounded nlargest instead of
+    # sorting every action from every team.
+    per_team: List[List[Dict[str, Any]]] = []
+    for team_key, plan in zip(team_cfgs, results):
+        if isinstance(plan, BaseException):
+            log.warning("could not build plan for %s: %s", team_key, plan)
+            continue
+        per_team.append(plan["actions"][:limit])
 
-    all_actions.sort(key=lambda a: a.gain, reverse=True)
-    return all_actions[:limit]
+    return _OrjsonResponse(
+        heapq.nlargest(limit, chain.from_iterable(per_team), key=itemgetter("gain"))
+    )
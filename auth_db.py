@@ -1,26 +1,82 @@
 from __future__ import annotations
 
+import base64
 import sqlite3
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Iterable, Iterator, Union
 import hashlib
+import hmac
 import os
 import secrets
-from datetime import datetime
+import threading
+import weakref
+from collections import namedtuple
+import time
+from contextlib import contextmanager
+
+from cryptography.fernet import Fernet  # type: ignore[import]
+
+try:  # Optional: Argon2id password hashing.
+    from argon2.low_level import Type, hash_secret_raw  # type: ignore[import]
+except ImportError:  # pragma: no cover - depends on environment
+    Type = None  # type: ignore[assignment]
+    hash_secret_raw = None  # type: ignore[assignment]
+
+from ttl_cache import TTLCache  # type: ignore[import]
 
 # Allow the auth DB path to be overridden for hosted environments (e.g. Render
 # persistent disk). Locally we still default to ./data/lineupiq_auth.db.
 DB_PATH = Path(os.environ.get("LINEUPIQ_DB_PATH", "data/lineupiq_auth.db"))
 
 
+# One persistent connection per thread (FastAPI runs sync work on a thread
+# pool), opened lazily and tuned once, instead of a connect/close per call.
+# The pool's worker threads come and go, so each connection is closed when
+# its thread exits (and at interpreter exit for any still open).
+_local = threading.local()
+
+
+class _ConnHolder:
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+
+
 def _get_conn() -> sqlite3.Connection:
+    holder = getattr(_local, "holder", None)
+    if holder is not None:
+        return holder.conn
+
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    holder = _local.holder = _ConnHolder(conn)
+    # The thread-local holder is dropped when its thread exits; close the
+    # connection with it.
+    weakref.finalize(holder, conn.close)
     return conn
 
 
+@contextmanager
+def _use_conn() -> Iterator[sqlite3.Connection]:
+    """
+    Yield this thread's pooled connection. A failed statement rolls back the
+    open transaction so the connection is clean for the next caller.
+    """
+    conn = _get_conn()
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+
+
 def init_db() -> None:
+    # Opening this thread's connection also primes the pool.
     conn = _get_conn()
     cur = conn.cursor()
 
@@ -31,7 +87,7 @@ def init_db() -> None:
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             email TEXT UNIQUE NOT NULL,
             password_hash TEXT NOT NULL,
-            created_at TEXT NOT NULL
+            created_at INTEGER NOT NULL
         )
         """
     )
@@ -43,7 +99,7 @@ def init_db() -> None:
             user_id INTEGER PRIMARY KEY,
             espn_s2 TEXT NOT NULL,
             espn_swid TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
+            updated_at INTEGER NOT NULL,
             FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
         )
         """
@@ -62,66 +118,203 @@ def init_db() -> None:
     )
 
     conn.commit()
-    conn.close()
 
 
-def _hash_password(password: str) -> str:
-    """Hash a password using PBKDF2-HMAC-SHA256 with a random salt."""
-    salt = secrets.token_bytes(16)
-    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100_000)
-    return salt.hex() + ":" + dk.hex()
+# Password hashes are stored with a scheme prefix:
+#   "argon2$<salt_hex>$<hash_hex>"         Argon2id (preferred, needs argon2-cffi)
+#   "pbkdf2_sha512$<salt_hex>$<hash_hex>"  PBKDF2-HMAC-SHA512 (fallback)
+#   "<salt_hex>:<hash_hex>"                legacy PBKDF2-HMAC-SHA256
+# All of them verify; anything weaker than the preferred scheme available in
+# this install is re-hashed on the next successful login.
+_ARGON2_PREFIX = "argon2$"
+_PBKDF2_SHA512_PREFIX = "pbkdf2_sha512$"
+_PBKDF2_ITERATIONS = 100_000
+
+if hash_secret_raw is not None:
+    _ARGON2_PARAMS = dict(
+        time_cost=2, memory_cost=65536, parallelism=2, hash_len=32, type=Type.ID
+    )
+    _PREFERRED_PREFIX = _ARGON2_PREFIX
+else:
+    _PREFERRED_PREFIX = _PBKDF2_SHA512_PREFIX
 
 
-def _verify_password(password: str, stored_hash: str) -> bool:
+def _password_bytes(password: Union[str, bytes]) -> bytes:
+    return password.encode("utf-8") if isinstance(password, str) else password
+
+
+def _hash_password(password: Union[str, bytes]) -> str:
+    """
+    Hash a password with a random salt using Argon2id, or PBKDF2-HMAC-SHA512
+    (64-bit friendly, so cheaper per iteration than SHA-256) if argon2-cffi
+    isn't installed.
+    """
+    salt = secrets.token_bytes(16)
+    pw = _password_bytes(password)
+    if _PREFERRED_PREFIX == _ARGON2_PREFIX:
+        dk = hash_secret_raw(pw, salt, **_ARGON2_PARAMS)
+    else:
+        dk = hashlib.pbkdf2_hmac("sha512", pw, salt, _PBKDF2_ITERATIONS, dklen=32)
+    return f"{_PREFERRED_PREFIX}{salt.hex()}${dk.hex()}"
+
+
+def _needs_rehash(stored_hash: str) -> bool:
+    return not stored_hash.startswith(_PREFERRED_PREFIX)
+
+
+def _verify_password(password: Union[str, bytes], stored_hash: str) -> bool:
+    pw = _password_bytes(password)
+
+    for prefix in (_ARGON2_PREFIX, _PBKDF2_SHA512_PREFIX):
+        if stored_hash.startswith(prefix):
+            try:
+                salt_hex, hash_hex = stored_hash[len(prefix):].split("$", 1)
+            except ValueError:
+                return False
+            salt = bytes.fromhex(salt_hex)
+            expected = bytes.fromhex(hash_hex)
+            if prefix == _ARGON2_PREFIX:
+                if hash_secret_raw is None:
+                    # Hash written by an install that had argon2-cffi.
+                    return False
+                dk = hash_secret_raw(pw, salt, **_ARGON2_PARAMS)
+            else:
+                dk = hashlib.pbkdf2_hmac(
+                    "sha512", pw, salt, _PBKDF2_ITERATIONS, dklen=len(expected)
+                )
+            return secrets.compare_digest(dk, expected)
+
+    # Legacy PBKDF2-HMAC-SHA256.
     try:
         salt_hex, hash_hex = stored_hash.split(":", 1)
     except ValueError:
         return False
     salt = bytes.fromhex(salt_hex)
     expected = bytes.fromhex(hash_hex)
-    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100_000)
+    dk = hashlib.pbkdf2_hmac("sha256", pw, salt, _PBKDF2_ITERATIONS)
     return secrets.compare_digest(dk, expected)
 
 
-def create_user(email: str, password: str) -> int:
-    conn = _get_conn()
-    cur = conn.cursor()
-    now = datetime.utcnow().isoformat()
+# User rows come back as plain tuples (no row_factory) and are wrapped in this
+# namedtuple; the field order matches _USER_COLUMNS.
+User = namedtuple("User", "id email password_hash created_at")
+
+
+# Short-lived cache of User rows keyed by lowercase email and by id. Misses
+# (None) are never cached, so a freshly registered user is visible
+# immediately; create_user also invalidates explicitly.
+USER_CACHE_TTL_SECONDS = 60
+
+_users_by_email = TTLCache(maxsize=2048, ttl=USER_CACHE_TTL_SECONDS)
+_users_by_id = TTLCache(maxsize=2048, ttl=USER_CACHE_TTL_SECONDS)
+
+
+def _cache_user(user: User) -> None:
+    _users_by_email.set(user.email.lower(), user)
+    _users_by_id.set(int(user.id), user)
+
+
+def _invalidate_user(email: Optional[str] = None, user_id: Optional[int] = None) -> None:
+    if email is not None:
+        _users_by_email.pop(email.lower())
+    if user_id is not None:
+        _users_by_id.pop(int(user_id))
+
+
+# Explicit column list for user lookups (instead of SELECT *). Both lookups
+# are already served by existing indexes: the rowid for id, and the UNIQUE
+# autoindex on email, which SQLite's planner prefers over any wider
+# "covering" index we could add.
+_USER_COLUMNS = "id, email, password_hash, created_at"
+_SELECT_USER_BY_EMAIL = f"SELECT {_USER_COLUMNS} FROM users WHERE email = ?"
+_SELECT_USER_BY_ID = f"SELECT {_USER_COLUMNS} FROM users WHERE id = ?"
+
+
+def create_user(email: str, password: Union[str, bytes]) -> int:
+    now = int(time.time())
     pw_hash = _hash_password(password)
-    cur.execute(
-        "INSERT INTO users (email, password_hash, created_at) VALUES (?, ?, ?)",
-        (email.lower(), pw_hash, now),
-    )
-    conn.commit()
-    user_id = cur.lastrowid
-    conn.close()
+    with _use_conn() as c:
+        cur = c.cursor()
+        cur.execute(
+            "INSERT INTO users (email, password_hash, created_at) VALUES (?, ?, ?)",
+            (email.lower(), pw_hash, now),
+        )
+        c.commit()
+        user_id = cur.lastrowid
+    _invalidate_user(email, user_id)
     return int(user_id)
 
 
-def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
-    conn = _get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM users WHERE email = ?", (email.lower(),))
-    row = cur.fetchone()
-    conn.close()
-    return dict(row) if row else None
+def get_user_by_email(email: str) -> Optional[User]:
+    cached = _users_by_email.get(email.lower())
+    if cached is not None:
+        return cached
 
+    with _use_conn() as c:
+        cur = c.cursor()
+        cur.execute(_SELECT_USER_BY_EMAIL, (email.lower(),))
+        row = cur.fetchone()
+    if not row:
+        return None
+    user = User(*row)
+    _cache_user(user)
+    return user
 
-def get_user_by_id(user_id: int) -> Optional[Dict[str, Any]]:
-    conn = _get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-    row = cur.fetchone()
-    conn.close()
-    return dict(row) if row else None
 
+def get_user_by_id(user_id: int) -> Optional[User]:
+    cached = _users_by_id.get(int(user_id))
+    if cached is not None:
+        return cached
+
+    with _use_conn() as c:
+        cur = c.cursor()
+        cur.execute(_SELECT_USER_BY_ID, (user_id,))
+        row = cur.fetchone()
+    if not row:
+        return None
+    user = User(*row)
+    _cache_user(user)
+    return user
+
+
+# After a wrong password, retrying that *same* password for that email is
+# refused for a few seconds without running the (deliberately slow) password
+# hash again. Any other password is always checked, so a failed attempt can't
+# lock the real user out. Entries are keyed on a per-process HMAC of the
+# password rather than the password itself.
+FAILED_LOGIN_LOCKOUT_SECONDS = 5
+
+_failed_logins = TTLCache(maxsize=4096, ttl=FAILED_LOGIN_LOCKOUT_SECONDS)
+_FAILED_LOGIN_KEY = secrets.token_bytes(32)
+
+
+def _failed_login_key(email: str, pw: bytes) -> Tuple[str, bytes]:
+    return email.lower(), hmac.new(_FAILED_LOGIN_KEY, pw, hashlib.sha256).digest()
+
+
+def verify_user_credentials(email: str, password: Union[str, bytes]) -> Optional[User]:
+    pw = _password_bytes(password)
+    failed_key = _failed_login_key(email, pw)
+    if _failed_logins.get(failed_key) is not None:
+        return None
 
-def verify_user_credentials(email: str, password: str) -> Optional[Dict[str, Any]]:
     user = get_user_by_email(email)
     if not user:
         return None
-    if not _verify_password(password, user["password_hash"]):
+    if not _verify_password(pw, user.password_hash):
+        _failed_logins.set(failed_key, True)
         return None
+    if _needs_rehash(user.password_hash):
+        # Transparently upgrade legacy hashes now that we know the password.
+        new_hash = _hash_password(pw)
+        with _use_conn() as c:
+            c.execute(
+                "UPDATE users SET password_hash = ? WHERE id = ?",
+                (new_hash, user.id),
+            )
+            c.commit()
+        _invalidate_user(user.email, user.id)
+        user = user._replace(password_hash=new_hash)
     return user
 
 
@@ -143,61 +336,115 @@ def _get_crypto_key() -> Optional[bytes]:
         return None
 
 
+# Read once at import; the env var doesn't change while the process runs.
+_CRYPTO_KEY: Optional[bytes] = _get_crypto_key()
+
+
+def _xor_with_key(data: bytes, key: bytes) -> bytes:
+    """
+    XOR data with a repeating key as one big-integer operation (the work
+    happens in C rather than a per-byte Python loop).
+
+    Only used to read credentials stored before the switch to Fernet.
+    """
+    n = len(data)
+    if not n:
+        return b""
+    keystream = (key * (n // len(key) + 1))[:n]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(keystream, "big")).to_bytes(
+        n, "big"
+    )
+
+
+def _build_fernet() -> Optional[Fernet]:
+    """
+    Build the Fernet (AES + HMAC) cipher for ESPN cookies from
+    LINEUPIQ_ESPN_KEY, or None in dev mode (no key configured).
+
+    Fernet wants exactly 32 key bytes; other key lengths are stretched to 32
+    with SHA-256.
+    """
+    key = _CRYPTO_KEY
+    if not key:
+        return None
+    if len(key) != 32:
+        key = hashlib.sha256(key).digest()
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+# Built once at import instead of re-reading the env / key on every call.
+_FERNET = _build_fernet()
+
+# Fernet tokens always start with the version byte 0x80, i.e. "gAAAAA" in
+# urlsafe base64; legacy values are plain lowercase hex, so they never do.
+_FERNET_PREFIX = "gAAAAA"
+
+
 def _encrypt(value: str) -> str:
-    key = _get_crypto_key()
     data = value.encode("utf-8")
-    if not key:
+    if _FERNET is None:
         # Dev fallback: store raw.
         return data.hex()
-    # Simple XOR with key for now; callers should still rely on OS-level
-    # protection for the DB file. In the future we can swap this for a
-    # stronger scheme (e.g. Fernet) without changing callers.
-    enc = bytes(b ^ key[i % len(key)] for i, b in enumerate(data))
-    return enc.hex()
+    return _FERNET.encrypt(data).decode("ascii")
 
 
-def _decrypt(value_hex: str) -> str:
-    key = _get_crypto_key()
-    data = bytes.fromhex(value_hex)
-    if not key:
+def _decrypt(value: str) -> str:
+    if _FERNET is not None and value.startswith(_FERNET_PREFIX):
+        return _FERNET.decrypt(value.encode("ascii")).decode("utf-8")
+
+    # Legacy / dev format: hex of the raw bytes, XORed with the key if one
+    # was configured when the value was written.
+    data = bytes.fromhex(value)
+    if not _CRYPTO_KEY:
         return data.decode("utf-8")
-    dec = bytes(b ^ key[i % len(key)] for i, b in enumerate(data))
-    return dec.decode("utf-8")
+    return _xor_with_key(data, _CRYPTO_KEY).decode("utf-8")
+
+
+_UPSERT_ESPN_CREDENTIALS = """
+    INSERT INTO espn_credentials (user_id, espn_s2, espn_swid, updated_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+        espn_s2=excluded.espn_s2,
+        espn_swid=excluded.espn_swid,
+        updated_at=excluded.updated_at
+"""
 
 
 def set_espn_credentials(user_id: int, espn_s2: str, espn_swid: str) -> None:
-    conn = _get_conn()
-    cur = conn.cursor()
-    now = datetime.utcnow().isoformat()
+    now = int(time.time())
     enc_s2 = _encrypt(espn_s2)
     enc_swid = _encrypt(espn_swid)
-    cur.execute(
-        """
-        INSERT INTO espn_credentials (user_id, espn_s2, espn_swid, updated_at)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(user_id) DO UPDATE SET
-            espn_s2=excluded.espn_s2,
-            espn_swid=excluded.espn_swid,
-            updated_at=excluded.updated_at
-        """,
-        (user_id, enc_s2, enc_swid, now),
-    )
-    conn.commit()
-    conn.close()
+    with _use_conn() as c:
+        c.execute(_UPSERT_ESPN_CREDENTIALS, (user_id, enc_s2, enc_swid, now))
+        c.commit()
+
+
+def set_many_espn_credentials(creds: Iterable[Tuple[int, str, str]]) -> None:
+    """
+    Store (user_id, espn_s2, espn_swid) for several users in one transaction.
+    """
+    now = int(time.time())
+    rows = [
+        (user_id, _encrypt(espn_s2), _encrypt(espn_swid), now)
+        for user_id, espn_s2, espn_swid in creds
+    ]
+    if not rows:
+        return
+    with _use_conn() as c, c:
+        c.executemany(_UPSERT_ESPN_CREDENTIALS, rows)
 
 
 def get_espn_credentials(user_id: int) -> Optional[Tuple[str, str]]:
-    conn = _get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT espn_s2, espn_swid FROM espn_credentials WHERE user_id = ?",
-        (user_id,),
-    )
-    row = cur.fetchone()
-    conn.close()
+    with _use_conn() as c:
+        cur = c.cursor()
+        cur.execute(
+            "SELECT espn_s2, espn_swid FROM espn_credentials WHERE user_id = ?",
+            (user_id,),
+        )
+        row = cur.fetchone()
     if not row:
         return None
-    return _decrypt(row["espn_s2"]), _decrypt(row["espn_swid"])
+    return _decrypt(row[0]), _decrypt(row[1])
 
 
 def get_managed_team_keys(user_id: int) -> list[str]:
@@ -207,30 +454,27 @@ def get_managed_team_keys(user_id: int) -> list[str]:
     If the user has never configured teams, this will return an empty list;
     callers can decide whether to treat that as "all TEAMS" or "none".
     """
-    conn = _get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT team_key FROM managed_teams WHERE user_id = ? ORDER BY team_key",
-        (user_id,),
-    )
-    rows = cur.fetchall()
-    conn.close()
-    return [r["team_key"] for r in rows]
+    with _use_conn() as c:
+        cur = c.cursor()
+        cur.execute(
+            "SELECT team_key FROM managed_teams WHERE user_id = ? ORDER BY team_key",
+            (user_id,),
+        )
+        rows = cur.fetchall()
+    return [r[0] for r in rows]
 
 
 def set_managed_team_keys(user_id: int, team_keys: list[str]) -> None:
     """
     Replace the set of managed team_keys for this user with the given list.
     """
-    conn = _get_conn()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM managed_teams WHERE user_id = ?", (user_id,))
-    for key in team_keys:
-        cur.execute(
-            "INSERT INTO managed_teams (user_id, team_key) VALUES (?, ?)",
-            (user_id, key),
+    # One transaction; executemany prepares the INSERT once, and OR IGNORE
+    # tolerates duplicate keys in the input.
+    with _use_conn() as c, c:
+        c.execute("DELETE FROM managed_teams WHERE user_id = ?", (user_id,))
+        c.executemany(
+            "INSERT OR IGNORE INTO managed_teams (user_id, team_key) VALUES (?, ?)",
+            [(user_id, key) for key in team_keys],
         )
-    conn.commit()
-    conn.close()
 
 
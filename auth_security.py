@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import base64
 import hmac
 import os
 import secrets
-from hashlib import sha256
+import time
+from functools import lru_cache
 from typing import Optional, Tuple
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
 
 SESSION_SECRET = os.environ.get("LINEUPIQ_SESSION_SECRET", "dev-session-secret-change-me").encode(
@@ -13,33 +15,57 @@ SESSION_SECRET = os.environ.get("LINEUPIQ_SESSION_SECRET", "dev-session-secret-c
 )
 SESSION_TTL_DAYS = 30
 
+_B64URL_CHARS = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+)
+_SIG_LEN = 43  # unpadded base64url of a 32-byte SHA-256 digest
+_NONCE_LEN = 22  # secrets.token_urlsafe(16)
+
+
+def _sign(base: bytes) -> bytes:
+    return hmac.digest(SESSION_SECRET, base, "sha256")
+
 
 def create_session_token(user_id: int) -> str:
     """
     Create a signed session token for the given user.
 
     Format: user_id:timestamp:nonce:signature
-    signature = HMAC-SHA256(SESSION_SECRET, f\"user_id:timestamp:nonce\")
+    signature = base64url(HMAC-SHA256(SESSION_SECRET, f\"user_id:timestamp:nonce\")),
+    without padding.
     """
     ts = int(datetime.now(tz=timezone.utc).timestamp())
-    nonce = secrets.token_hex(16)
-    base = f"{user_id}:{ts}:{nonce}"
-    sig = hmac.new(SESSION_SECRET, base.encode("utf-8"), sha256).hexdigest()
-    return f"{base}:{sig}"
+    nonce = secrets.token_urlsafe(16)
+    base = b"%d:%d:%s" % (user_id, ts, nonce.encode("ascii"))
+    sig = base64.urlsafe_b64encode(_sign(base)).rstrip(b"=").decode("ascii")
+    return f"{user_id}:{ts}:{nonce}:{sig}"
 
 
-def parse_session_token(token: str) -> Optional[int]:
+@lru_cache(maxsize=4096)
+def _verified_user_id(token: str) -> Optional[Tuple[int, int]]:
     """
-    Validate a session token and return the user_id if valid, else None.
+    Verify a token's signature and return (user_id, expires_at_ts), or None.
+
+    Cached per token string: a browser presents the same cookie on every
+    request, so the HMAC is only computed once per token. Expiry is *not*
+    checked here (it changes over time); see parse_session_token.
     """
     try:
         user_str, ts_str, nonce, sig = token.split(":", 4)
-        base = f"{user_str}:{ts_str}:{nonce}"
     except ValueError:
         return None
 
-    expected_sig = hmac.new(SESSION_SECRET, base.encode("utf-8"), sha256).hexdigest()
-    if not hmac.compare_digest(expected_sig, sig):
+    # Cheap structural checks first so garbage tokens never reach the HMAC.
+    if len(sig) != _SIG_LEN or len(nonce) != _NONCE_LEN or not _B64URL_CHARS.issuperset(sig):
+        return None
+
+    try:
+        sig_bytes = base64.urlsafe_b64decode(sig + "=")
+    except ValueError:
+        return None
+    # Everything before the final ":" is the signed base.
+    base = token[: -(_SIG_LEN + 1)].encode("utf-8")
+    if not hmac.compare_digest(_sign(base), sig_bytes):
         return None
 
     try:
@@ -48,11 +74,20 @@ def parse_session_token(token: str) -> Optional[int]:
     except ValueError:
         return None
 
+    return user_id, ts + SESSION_TTL_DAYS * 86400
+
+
+def parse_session_token(token: str) -> Optional[int]:
+    """
+    Validate a session token and return the user_id if valid, else None.
+    """
+    verified = _verified_user_id(token)
+    if verified is None:
+        return None
+
+    user_id, expires_at = verified
     # Expiry check
-    created_at = datetime.fromtimestamp(ts, tz=timezone.utc)
-    if created_at < datetime.now(tz=timezone.utc) - timedelta(days=SESSION_TTL_DAYS):
+    if time.time() > expires_at:
         return None
 
     return user_id
-
-
@@ -1,6 +1,10 @@
 # config.py
+import functools
+from collections.abc import Mapping
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Any, Iterator
 import os
 
 # ====== FantasyPros / season config ======
@@ -28,44 +32,109 @@ TEAM_NAME_KEYWORD: str = "Can't Teach Matchups"
 
 
 # ====== Multi-team config ======
-TEAMS: Dict[str, Dict[str, Any]] = {
-    "cant_teach_matchups": {
-        "platform": "espn",
-        "league_id": ESPN_LEAGUE_ID,
-        "season_year": ESPN_YEAR,
-        "team_name_keyword": TEAM_NAME_KEYWORD,
-        "espn_s2": ESPN_S2,
-        "espn_swid": ESPN_SWID,
-        "scoring": SCORING,
-    },
-    "b00bs_b00bs_b00bs": {
-        "platform": "espn",
-        "league_id": 973091,
-        "season_year": ESPN_YEAR,
-        "team_name_keyword": "B00bs B00bs B00bs",
-        "espn_s2": ESPN_S2,
-        "espn_swid": ESPN_SWID,
-        "scoring": SCORING,
-    },
-    "stinky_steinerts": {
-        "platform": "espn",
-        "league_id": 232132462,
-        "season_year": ESPN_YEAR,
-        "team_name_keyword": "Stinky Steinerts",
-        "espn_s2": ESPN_S2,
-        "espn_swid": ESPN_SWID,
-        "scoring": SCORING,
-    },
-    "huge_b1tches": {
-        "platform": "espn",
-        "league_id": 482478780,
-        "season_year": ESPN_YEAR,
-        "team_name_keyword": "Huge B1tches",
-        "espn_s2": ESPN_S2,
-        "espn_swid": ESPN_SWID,
-        "scoring": SCORING,
-    },
-
-}
+@dataclass(frozen=True, slots=True)
+class EspnCreds:
+    espn_s2: str
+    espn_swid: str
+
+
+@dataclass(frozen=True, slots=True)
+class TeamConfig(Mapping):
+    """
+    Immutable per-team config. Teams logged in with the same ESPN account
+    share one EspnCreds instance instead of each carrying a copy.
+
+    Still behaves like the old dict (cfg["league_id"], cfg.get(...),
+    {**cfg, ...}) so existing callers keep working.
+    """
+
+    platform: str
+    league_id: int
+    season_year: int
+    team_name_keyword: str
+    scoring: str
+    creds: EspnCreds
+
+    @property
+    def espn_s2(self) -> str:
+        return self.creds.espn_s2
+
+    @property
+    def espn_swid(self) -> str:
+        return self.creds.espn_swid
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _TEAM_CONFIG_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_TEAM_CONFIG_KEYS)
+
+    def __len__(self) -> int:
+        return len(_TEAM_CONFIG_KEYS)
+
+
+_TEAM_CONFIG_KEYS = (
+    "platform",
+    "league_id",
+    "season_year",
+    "team_name_keyword",
+    "espn_s2",
+    "espn_swid",
+    "scoring",
+)
+
+
+@functools.cache
+def get_teams() -> Mapping[str, TeamConfig]:
+    """
+    Build the multi-team config on first use and return the same read-only
+    mapping afterwards. Call get_teams.cache_clear() to rebuild it (e.g.
+    after changing ESPN_S2 / ESPN_SWID in tests).
+    """
+    creds = EspnCreds(espn_s2=ESPN_S2, espn_swid=ESPN_SWID)
+    return MappingProxyType({
+        "cant_teach_matchups": TeamConfig(
+            platform="espn",
+            league_id=ESPN_LEAGUE_ID,
+            season_year=ESPN_YEAR,
+            team_name_keyword=TEAM_NAME_KEYWORD,
+            scoring=SCORING,
+            creds=creds,
+        ),
+        "b00bs_b00bs_b00bs": TeamConfig(
+            platform="espn",
+            league_id=973091,
+            season_year=ESPN_YEAR,
+            team_name_keyword="B00bs B00bs B00bs",
+            scoring=SCORING,
+            creds=creds,
+        ),
+        "stinky_steinerts": TeamConfig(
+            platform="espn",
+            league_id=232132462,
+            season_year=ESPN_YEAR,
+            team_name_keyword="Stinky Steinerts",
+            scoring=SCORING,
+            creds=creds,
+        ),
+        "huge_b1tches": TeamConfig(
+            platform="espn",
+            league_id=482478780,
+            season_year=ESPN_YEAR,
+            team_name_keyword="Huge B1tches",
+            scoring=SCORING,
+            creds=creds,
+        ),
+    })
+
+
+def __getattr__(name: str) -> Any:
+    # Backwards compatibility for `from config import TEAMS`.
+    if name == "TEAMS":
+        return get_teams()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 DEFAULT_TEAM_KEY: str = "cant_teach_matchups"
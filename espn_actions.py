@@ -12,12 +12,17 @@ The rest of the app (FastAPI + UI) should not need to change; they only call
 `apply_actions_for_team` with a team config + a list of action dicts.
 """
 
-from typing import Dict, Any, List, Optional
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime, timezone
+from http.cookiejar import DefaultCookiePolicy
 
+import orjson  # type: ignore[import]
 import requests  # type: ignore[import]
+from requests.adapters import HTTPAdapter  # type: ignore[import]
 
-from espn_adapter import _get_league, _find_my_team  # type: ignore[import]
+from espn_adapter import _get_league, _find_my_team, invalidate  # type: ignore[import]
 from config import CURRENT_WEEK  # type: ignore[import]
 
 
@@ -40,9 +45,23 @@ SLOT_CODE_TO_ID: Dict[str, int] = {
     "INJURY_RESERVE": 21,
     "OP": 24,         # Offensive player slot (Superflex / OP)
 }
+# Keys are matched upper-cased, whatever case the caller's slot code uses.
+SLOT_CODE_TO_ID = {k.upper(): v for k, v in SLOT_CODE_TO_ID.items()}
+
+# Request headers for lm-api-writes transactions.
+HEADERS: Dict[str, str] = {
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+    "x-fantasy-platform": "espn-fantasy-web",
+    "x-fantasy-source": "kona",
+}
+
+# Independent ESPN writes within one apply batch are sent concurrently, up to
+# this many at a time.
+MAX_CONCURRENT_WRITES = 8
 
 
-def _is_player_locked(p: Any) -> bool:
+def _is_player_locked(p: Any, now: Optional[datetime] = None) -> bool:
     """
     Best-effort check to see if ESPN considers a player locked for lineup
     changes (game started or otherwise not editable).
@@ -50,6 +69,9 @@ def _is_player_locked(p: Any) -> bool:
     We deliberately fail *open* (return False) if we can't determine lock
     status, so we never block legal moves; this is an extra guardrail on top
     of ESPN's own validation.
+
+    now: an aware datetime to compare kickoff against (defaults to the
+    current time), so a batch can read the clock once.
     """
     # Some espn_api versions expose an explicit flag.
     locked_flag = getattr(p, "lineupLocked", None)
@@ -64,17 +86,50 @@ def _is_player_locked(p: Any) -> bool:
             dt = entry.get("date") or entry.get("startDate")
             if isinstance(dt, datetime):
                 # Treat kickoff time as the lock point.
-                if dt.tzinfo is None:
+                if now is None:
                     now = datetime.now(tz=timezone.utc)
-                    lock_time = dt.replace(tzinfo=timezone.utc)
-                else:
-                    now = datetime.now(tz=dt.tzinfo)
-                    lock_time = dt
-                return now >= lock_time
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=timezone.utc)
+                return now >= dt
 
     return False
 
 
+# Extract ESPN ids / slot ids. These attribute names come from espn_api's
+# Player object (see your REPL: playerId, lineupSlot, etc.).
+def _player_id(p: Any) -> Optional[int]:
+    return getattr(p, "playerId", None) or getattr(p, "id", None)
+
+
+def _slot_id(p: Any) -> Optional[int]:
+    code = getattr(p, "lineupSlot", None)
+    if code is None:
+        return None
+    key = code.upper() if isinstance(code, str) else str(code).upper()
+    return SLOT_CODE_TO_ID.get(key)
+
+
+@functools.lru_cache(maxsize=32)
+def _normalize_swid(raw: str) -> str:
+    """SWID as memberId expects it: wrapped in braces ("" if unset)."""
+    r = raw.strip()
+    if r.startswith("{") and r.endswith("}"):
+        return r
+    return "{" + r.strip("{}") + "}" if r else ""
+
+
+def _result(
+    action: Dict[str, Any], mode: str, success: bool, message: str
+) -> Dict[str, Any]:
+    return {
+        "id": action.get("id"),
+        "type": action.get("type"),
+        "mode": mode,
+        "success": success,
+        "message": message,
+    }
+
+
 def _http_session_for_team(team_cfg: Dict[str, Any]) -> requests.Session:
     """
     Build a requests.Session with ESPN auth cookies populated from team_cfg.
@@ -82,6 +137,10 @@ def _http_session_for_team(team_cfg: Dict[str, Any]) -> requests.Session:
     This uses the same espn_s2 / swid values you already store in config.TEAMS.
     """
     s = requests.Session()
+    # Enough pooled connections for a batch's concurrent writes.
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
     espn_s2 = team_cfg.get("espn_s2")
     swid = team_cfg.get("espn_swid")
     if espn_s2:
@@ -91,13 +150,124 @@ def _http_session_for_team(team_cfg: Dict[str, Any]) -> requests.Session:
     return s
 
 
-def _apply_bench_to_start_http(
-    session: requests.Session,
+def build_shared_http_session() -> requests.Session:
+    """
+    Build one pooled requests.Session meant to be shared across requests and
+    users (the FastAPI app creates it at startup and passes it down as
+    team_cfg["http_session"]), so ESPN writes reuse keep-alive connections
+    instead of paying DNS + TLS per apply.
+
+    Because the session is shared, its cookie jar refuses to store anything:
+    each user's ESPN cookies are sent per request via _auth_cookies().
+    """
+    s = requests.Session()
+    s.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+def _auth_cookies(team_cfg: Dict[str, Any]) -> Dict[str, str]:
+    """
+    ESPN auth cookies for one team config, to pass per request.
+    """
+    cookies: Dict[str, str] = {}
+    espn_s2 = team_cfg.get("espn_s2")
+    swid = team_cfg.get("espn_swid")
+    if espn_s2:
+        cookies["espn_s2"] = espn_s2
+    if swid:
+        cookies["SWID"] = swid
+    return cookies
+
+
+# (exact name -> player, lowercased name -> player)
+NameIndex = Tuple[Dict[str, Any], Dict[str, Any]]
+
+_EMPTY_INDEX: NameIndex = ({}, {})
+
+
+def _add_to_index(index: NameIndex, p: Any) -> None:
+    name = getattr(p, "name", "")
+    index[0].setdefault(name, p)
+    index[1].setdefault(name.lower(), p)
+
+
+def _name_index(players: List[Any]) -> NameIndex:
+    """
+    Index players by exact and by lowercased name in a single pass. The
+    first player wins on duplicates, like the linear scans this replaces.
+    """
+    index: NameIndex = ({}, {})
+    for p in players:
+        _add_to_index(index, p)
+    return index
+
+
+def _load_http_context(team_cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fetch league / team / roster once per apply batch; every action in the
+    batch reuses it instead of re-fetching the league from ESPN. Players are
+    looked up through name indexes ("roster_index", and "fa_index" keyed by
+    position, which is built lazily by the first FA action).
+
+    If loading fails, the returned context only has an "error" message, which
+    each action then reports.
+    """
+    try:
+        # Always start a write batch from ESPN's current state rather than the
+        # read cache; the context gets mutated as writes land.
+        league = _get_league(team_cfg, fresh=True)
+        my_team = _find_my_team(league, team_cfg)
+        roster = list(my_team.roster)
+    except Exception as exc:  # pragma: no cover - defensive
+        return {"error": f"Failed to load league/team from espn_adapter: {exc}"}
+
+    # League / team / scoring context shared by every transaction.
+    team_id = getattr(my_team, "team_id", None) or getattr(my_team, "teamId", None)
+    scoring_period = getattr(league, "currentScoringPeriodId", None) or getattr(
+        league, "current_week", None
+    )
+    if scoring_period is None:
+        scoring_period = CURRENT_WEEK + 1  # conservative fallback
+
+    member_id = _normalize_swid(str(team_cfg.get("espn_swid", "")))
+
+    url = (
+        "https://lm-api-writes.fantasy.espn.com/apis/v3/games/ffl/"
+        f"seasons/{team_cfg['season_year']}/segments/0/"
+        f"leagues/{team_cfg['league_id']}/transactions/"
+    )
+
+    return {
+        "now": datetime.now(tz=timezone.utc),
+        "team_id": team_id,
+        "scoring_period": int(scoring_period),
+        "member_id": member_id,
+        "url": url,
+        "league": league,
+        "my_team": my_team,
+        "roster": roster,
+        "roster_index": _name_index(roster),
+        "fa_index": None,
+    }
+
+
+def _find_by_name(index: NameIndex, name: str) -> Any:
+    p = index[0].get(name)
+    return p if p is not None else index[1].get(name.lower())
+
+
+def _prepare_bench_to_start_http(
     team_cfg: Dict[str, Any],
+    ctx: Dict[str, Any],
     action: Dict[str, Any],
 ) -> Dict[str, Any]:
     """
-    HTTP implementation stub for a bench_to_start action.
+    HTTP implementation for a bench_to_start action: resolves the players and
+    builds the transaction, or returns a failed result dict. The prepared
+    transaction (it has a "payload" key) is sent by _submit_transaction.
 
     This mirrors the "ROSTER" transaction shape you captured in notes.txt.
     It is written so you can safely iterate:
@@ -110,81 +280,42 @@ def _apply_bench_to_start_http(
     add_name = action.get("add_name")
     drop_name = action.get("drop_name")
     if not add_name or not drop_name:
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": "Missing add_name/drop_name on action; cannot build swap.",
-        }
+        return _result(
+            action, "http", False,
+            "Missing add_name/drop_name on action; cannot build swap.",
+        )
 
-    try:
-        league = _get_league(team_cfg)
-        my_team = _find_my_team(league, team_cfg)
-        roster = list(my_team.roster)
-    except Exception as exc:  # pragma: no cover - defensive
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": f"Failed to load league/team from espn_adapter: {exc}",
-        }
+    if "error" in ctx:
+        return _result(action, "http", False, ctx["error"])
+    roster_index = ctx["roster_index"]
 
     # Find the two players on your ESPN roster by name.
-    def _find_player(name: str):
-        exact = [p for p in roster if getattr(p, "name", "") == name]
-        if exact:
-            return exact[0]
-        lower = name.lower()
-        ci = [p for p in roster if getattr(p, "name", "").lower() == lower]
-        return ci[0] if ci else None
-
-    bench_p = _find_player(add_name)
-    starter_p = _find_player(drop_name)
+    bench_p = _find_by_name(roster_index, add_name)
+    starter_p = _find_by_name(roster_index, drop_name)
 
     if bench_p is None or starter_p is None:
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": (
-                f"Could not resolve players on ESPN roster: "
-                f"add_name={add_name!r}, drop_name={drop_name!r}."
-            ),
-        }
+        return _result(
+            action, "http", False,
+            f"Could not resolve players on ESPN roster: "
+            f"add_name={add_name!r}, drop_name={drop_name!r}.",
+        )
 
     # Game-start guardrail: never attempt to move players that ESPN already
     # considers locked for this scoring period.
-    if _is_player_locked(bench_p) or _is_player_locked(starter_p):
+    bench_locked = _is_player_locked(bench_p, ctx["now"])
+    starter_locked = _is_player_locked(starter_p, ctx["now"])
+    if bench_locked or starter_locked:
         locked_names: List[str] = []
-        if _is_player_locked(bench_p):
+        if bench_locked:
             locked_names.append(getattr(bench_p, "name", "bench player"))
-        if _is_player_locked(starter_p):
+        if starter_locked:
             locked_names.append(getattr(starter_p, "name", "starter player"))
         who = ", ".join(locked_names) if locked_names else "one or more players"
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": (
-                f"Cannot apply bench_to_start swap: {who} is locked because "
-                "their game has already started."
-            ),
-        }
-
-    # Extract ESPN ids / slot ids. These attribute names come from espn_api's
-    # Player object (see your REPL: playerId, lineupSlot, etc.).
-    def _player_id(p: Any) -> Optional[int]:
-        return getattr(p, "playerId", None) or getattr(p, "id", None)
-
-    def _slot_id(p: Any) -> Optional[int]:
-        code = getattr(p, "lineupSlot", None)
-        if code is None:
-            return None
-        return SLOT_CODE_TO_ID.get(str(code))
+        return _result(
+            action, "http", False,
+            f"Cannot apply bench_to_start swap: {who} is locked because "
+            "their game has already started.",
+        )
 
     bench_player_id = _player_id(bench_p)
     starter_player_id = _player_id(starter_p)
@@ -197,47 +328,21 @@ def _apply_bench_to_start_http(
         or bench_slot_id is None
         or starter_slot_id is None
     ):
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": (
-                "Missing or non-numeric playerId/lineupSlot on ESPN Player "
-                "objects; inspect my_team.roster in a REPL to derive the "
-                "proper slot-id mapping before enabling HTTP writes."
-            ),
-        }
-
-    # League / team / scoring context
-    team_id = getattr(my_team, "team_id", None) or getattr(my_team, "teamId", None)
-    scoring_period = getattr(league, "currentScoringPeriodId", None) or getattr(
-        league, "current_week", None
-    )
-    if scoring_period is None:
-        scoring_period = CURRENT_WEEK + 1  # conservative fallback
+        return _result(
+            action, "http", False,
+            "Missing or non-numeric playerId/lineupSlot on ESPN Player "
+            "objects; inspect my_team.roster in a REPL to derive the "
+            "proper slot-id mapping before enabling HTTP writes.",
+        )
 
-    # SWID in memberId is expected with braces.
-    raw_swid = str(team_cfg.get("espn_swid", "")).strip()
-    if not raw_swid:
-        member_id = ""
-    elif raw_swid.startswith("{") and raw_swid.endswith("}"):
-        member_id = raw_swid
-    else:
-        member_id = "{" + raw_swid.strip("{}") + "}"
-
-    url = (
-        "https://lm-api-writes.fantasy.espn.com/apis/v3/games/ffl/"
-        f"seasons/{team_cfg['season_year']}/segments/0/"
-        f"leagues/{team_cfg['league_id']}/transactions/"
-    )
+    team_id = ctx["team_id"]
 
     payload: Dict[str, Any] = {
         "isLeagueManager": False,
         "teamId": team_id,
         "type": "ROSTER",
-        "memberId": member_id,
-        "scoringPeriodId": int(scoring_period),
+        "memberId": ctx["member_id"],
+        "scoringPeriodId": ctx["scoring_period"],
         "executionType": "EXECUTE",
         "items": [
             {
@@ -255,38 +360,21 @@ def _apply_bench_to_start_http(
         ],
     }
 
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "x-fantasy-platform": "espn-fantasy-web",
-        "x-fantasy-source": "kona",
-    }
-
-    try:
-        resp = session.post(url, json=payload, headers=headers, timeout=10)
-    except Exception as exc:  # pragma: no cover - network/IO
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": f"HTTP error calling ESPN lineup endpoint: {exc}",
-        }
-
-    if not resp.ok:
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": f"ESPN lineup API returned HTTP {resp.status_code}: {resp.text[:200]}",
-        }
+    def _on_success() -> None:
+        # Keep the batch context in step with ESPN so later actions in the
+        # same batch see the swapped slots.
+        bench_p.lineupSlot, starter_p.lineupSlot = (
+            starter_p.lineupSlot,
+            bench_p.lineupSlot,
+        )
 
     return {
-        "id": action.get("id"),
-        "type": action.get("type"),
-        "mode": "http",
-        "success": True,
+        "action": action,
+        "url": ctx["url"],
+        "payload": payload,
+        "player_ids": {int(bench_player_id), int(starter_player_id)},
+        "endpoint": "lineup",
+        "on_success": _on_success,
         "message": (
             f"Successfully submitted bench_to_start transaction for "
             f"{add_name} over {drop_name}."
@@ -294,13 +382,15 @@ def _apply_bench_to_start_http(
     }
 
 
-def _apply_fa_bench_http(
-    session: requests.Session,
+def _prepare_fa_bench_http(
     team_cfg: Dict[str, Any],
+    ctx: Dict[str, Any],
     action: Dict[str, Any],
 ) -> Dict[str, Any]:
     """
     HTTP implementation for a fa_for_bench action when can_add_now=True.
+    Like _prepare_bench_to_start_http, returns either a failed result dict
+    or a prepared transaction.
 
     Sends a FREEAGENT transaction with an ADD for the FA and a DROP for the
     specified bench player, mirroring the curl captured in notes.txt.
@@ -311,158 +401,88 @@ def _apply_fa_bench_http(
     can_add_now = bool(action.get("can_add_now", False))
 
     if not can_add_now:
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": "Cannot apply fa_for_bench: can_add_now is False (waiver claim).",
-        }
+        return _result(
+            action, "http", False,
+            "Cannot apply fa_for_bench: can_add_now is False (waiver claim).",
+        )
 
     if not add_name or not drop_name:
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": "Missing add_name/drop_name on action; cannot apply FA move.",
-        }
+        return _result(
+            action, "http", False,
+            "Missing add_name/drop_name on action; cannot apply FA move.",
+        )
 
-    try:
-        league = _get_league(team_cfg)
-        my_team = _find_my_team(league, team_cfg)
-    except Exception as exc:  # pragma: no cover - defensive
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": f"Failed to load league/team from espn_adapter: {exc}",
-        }
-
-    roster = list(my_team.roster)
-
-    def _find_roster_player(name: str):
-        exact = [p for p in roster if getattr(p, "name", "") == name]
-        if exact:
-            return exact[0]
-        lower = name.lower()
-        ci = [p for p in roster if getattr(p, "name", "").lower() == lower]
-        return ci[0] if ci else None
-
-    drop_p = _find_roster_player(drop_name)
+    if "error" in ctx:
+        return _result(action, "http", False, ctx["error"])
+    league = ctx["league"]
+    roster = ctx["roster"]
+
+    drop_p = _find_by_name(ctx["roster_index"], drop_name)
     if drop_p is None:
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": f"Could not find drop player {drop_name!r} on your roster.",
-        }
+        return _result(
+            action, "http", False,
+            f"Could not find drop player {drop_name!r} on your roster.",
+        )
 
     # Guardrail: do not attempt to drop a locked player (game already started).
-    if _is_player_locked(drop_p):
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": (
-                f"Cannot submit free-agent transaction: drop target "
-                f"{getattr(drop_p, 'name', drop_name)!r} is locked because "
-                "their game has already started."
-            ),
-        }
-
-    # Locate the FA in the current free agent pool by name/position.
-    try:
-        fa_players = league.free_agents(size=200)
-    except Exception as exc:  # pragma: no cover - defensive
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": f"Failed to load free agents from ESPN: {exc}",
-        }
-
-    def _find_fa_player(name: str, position: str):
-        exact = [
-            p
-            for p in fa_players
-            if getattr(p, "name", "") == name
-            and getattr(p, "position", "") == position
-        ]
-        if exact:
-            return exact[0]
-        lower = name.lower()
-        ci = [
-            p
-            for p in fa_players
-            if getattr(p, "name", "").lower() == lower
-            and getattr(p, "position", "") == position
-        ]
-        return ci[0] if ci else None
+    if _is_player_locked(drop_p, ctx["now"]):
+        return _result(
+            action, "http", False,
+            f"Cannot submit free-agent transaction: drop target "
+            f"{getattr(drop_p, 'name', drop_name)!r} is locked because "
+            "their game has already started.",
+        )
+
+    # Locate the FA in the current free agent pool by name/position. The pool
+    # is fetched once per batch, by the first FA action that gets this far:
+    # keep the cheap checks above (can_add_now, names, drop lookup, lock) ahead
+    # of it so a failing action never costs the ESPN round-trip, and a
+    # bench_to_start-only batch never fetches the pool at all.
+    fa_index = ctx["fa_index"]
+    if fa_index is None:
+        try:
+            fa_players = league.free_agents(size=200)
+        except Exception as exc:  # pragma: no cover - defensive
+            return _result(
+                action, "http", False,
+                f"Failed to load free agents from ESPN: {exc}",
+            )
+        # One pass over the pool, bucketing by position as we index names.
+        fa_index = ctx["fa_index"] = {}
+        for p in fa_players:
+            pos = getattr(p, "position", "")
+            pos_index = fa_index.get(pos)
+            if pos_index is None:
+                pos_index = fa_index[pos] = ({}, {})
+            _add_to_index(pos_index, p)
 
     fa_pos = action.get("add_position") or ""
-    fa_p = _find_fa_player(add_name, fa_pos)
+    fa_p = _find_by_name(fa_index.get(fa_pos, _EMPTY_INDEX), add_name)
     if fa_p is None:
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": (
-                f"Could not find free agent {add_name!r} ({fa_pos}) "
-                "in ESPN free agent pool."
-            ),
-        }
-
-    def _player_id(p: Any) -> Optional[int]:
-        return getattr(p, "playerId", None) or getattr(p, "id", None)
+        return _result(
+            action, "http", False,
+            f"Could not find free agent {add_name!r} ({fa_pos}) "
+            "in ESPN free agent pool.",
+        )
 
     fa_player_id = _player_id(fa_p)
     drop_player_id = _player_id(drop_p)
 
     if fa_player_id is None or drop_player_id is None:
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": (
-                "Missing playerId for FA/drop player; inspect espn_api Player "
-                "objects to update espn_actions."
-            ),
-        }
+        return _result(
+            action, "http", False,
+            "Missing playerId for FA/drop player; inspect espn_api Player "
+            "objects to update espn_actions.",
+        )
 
-    team_id = getattr(my_team, "team_id", None) or getattr(my_team, "teamId", None)
-    scoring_period = getattr(league, "currentScoringPeriodId", None) or getattr(
-        league, "current_week", None
-    )
-    if scoring_period is None:
-        scoring_period = CURRENT_WEEK + 1
-
-    raw_swid = str(team_cfg.get("espn_swid", "")).strip()
-    if not raw_swid:
-        member_id = ""
-    elif raw_swid.startswith("{") and raw_swid.endswith("}"):
-        member_id = raw_swid
-    else:
-        member_id = "{" + raw_swid.strip("{}") + "}"
-
-    url = (
-        "https://lm-api-writes.fantasy.espn.com/apis/v3/games/ffl/"
-        f"seasons/{team_cfg['season_year']}/segments/0/"
-        f"leagues/{team_cfg['league_id']}/transactions/"
-    )
+    team_id = ctx["team_id"]
 
     payload: Dict[str, Any] = {
         "isLeagueManager": False,
         "teamId": team_id,
         "type": "FREEAGENT",
-        "memberId": member_id,
-        "scoringPeriodId": int(scoring_period),
+        "memberId": ctx["member_id"],
+        "scoringPeriodId": ctx["scoring_period"],
         "executionType": "EXECUTE",
         "items": [
             {
@@ -478,45 +498,183 @@ def _apply_fa_bench_http(
         ],
     }
 
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "x-fantasy-platform": "espn-fantasy-web",
-        "x-fantasy-source": "kona",
+    def _on_success() -> None:
+        # The FA lands on our bench in place of the dropped player; reflect
+        # that in the batch context so later actions don't reuse either one.
+        fa_p.lineupSlot = "BE"
+        roster[roster.index(drop_p)] = fa_p
+        ctx["roster_index"] = _name_index(roster)
+        for names in fa_index[fa_pos]:
+            for key in [k for k, p in names.items() if p is fa_p]:
+                del names[key]
+
+    return {
+        "action": action,
+        "url": ctx["url"],
+        "payload": payload,
+        "player_ids": {int(fa_player_id), int(drop_player_id)},
+        "endpoint": "free-agent",
+        "on_success": _on_success,
+        "message": (
+            f"Successfully submitted fa_for_bench transaction: "
+            f"ADD {add_name} / DROP {drop_name}."
+        ),
     }
 
+
+def _submit_transaction(
+    session: requests.Session,
+    team_cfg: Dict[str, Any],
+    prepared: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    POST one prepared transaction to ESPN and build its result dict. The
+    context update (prepared["on_success"]) is left to the caller so it runs
+    on the caller's thread.
+    """
+    action = prepared["action"]
+    endpoint = prepared["endpoint"]
     try:
-        resp = session.post(url, json=payload, headers=headers, timeout=10)
+        resp = session.post(
+            prepared["url"],
+            # HEADERS already sets Content-Type: application/json.
+            data=orjson.dumps(prepared["payload"]),
+            headers=HEADERS,
+            cookies=_auth_cookies(team_cfg),
+            timeout=10,
+        )
     except Exception as exc:  # pragma: no cover - network/IO
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": f"HTTP error calling ESPN free-agent endpoint: {exc}",
-        }
+        return _result(
+            action, "http", False,
+            f"HTTP error calling ESPN {endpoint} endpoint: {exc}",
+        )
 
     if not resp.ok:
-        return {
-            "id": action.get("id"),
-            "type": action.get("type"),
-            "mode": "http",
-            "success": False,
-            "message": f"ESPN free-agent API returned HTTP {resp.status_code}: {resp.text[:200]}",
-        }
+        return _result(
+            action, "http", False,
+            f"ESPN {endpoint} API returned HTTP {resp.status_code}: "
+            # Only the first 200 bytes are shown; don't decode the whole body.
+            f"{resp.content[:200].decode('utf-8', errors='replace')}",
+        )
 
+    return _result(action, "http", True, prepared["message"])
+
+
+def _prepare_http(
+    team_cfg: Dict[str, Any],
+    ctx: Dict[str, Any],
+    action: Dict[str, Any],
+) -> Dict[str, Any]:
+    action_type = action.get("type", "")
+    if action_type == "bench_to_start":
+        return _prepare_bench_to_start_http(team_cfg, ctx, action)
+    if action_type in ("fa_for_bench", "fa_for_starter"):
+        # For now, treat FA->starter as "add to bench, drop" and allow the
+        # optimizer / UI to promote them on the next run. This is safer than
+        # trying to manipulate lineup slots in the same transaction.
+        return _prepare_fa_bench_http(team_cfg, ctx, action)
     return {
-        "id": action.get("id"),
-        "type": action.get("type"),
+        "id": action.get("id", ""),
+        "type": action_type,
         "mode": "http",
-        "success": True,
-        "message": (
-            f"Successfully submitted fa_for_bench transaction: "
-            f"ADD {add_name} / DROP {drop_name}."
-        ),
+        "success": False,
+        "message": "HTTP execution not implemented for this action type.",
+    }
+
+
+def _apply_http_batch(
+    team_cfg: Dict[str, Any], actions: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Apply a batch over HTTP. Actions are prepared in order against the batch
+    context, and transactions that touch disjoint players are POSTed
+    concurrently (the work is all ESPN round-trips).
+
+    An action waits for the in-flight group to land first if it touches one
+    of its players, or if it can't be resolved yet (e.g. it drops an FA that
+    an earlier action in the batch adds), so a batch still behaves as if it
+    were applied one action at a time.
+    """
+    if not actions:
+        return []
+
+    # Prefer the app-wide pooled session if the caller passed one; otherwise
+    # create a session for this batch.
+    session = team_cfg.get("http_session") or _http_session_for_team(team_cfg)
+    ctx = _load_http_context(team_cfg)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(actions)
+    pending: List[Tuple[int, Dict[str, Any]]] = []
+    pending_ids: Set[int] = set()
+
+    def _submit(item: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+        return _submit_transaction(session, team_cfg, item[1])
+
+    def _flush() -> None:
+        if len(pending) == 1:
+            outcomes = [_submit(pending[0])]
+        else:
+            workers = min(MAX_CONCURRENT_WRITES, len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(_submit, pending))
+        for (idx, prepared), result in zip(pending, outcomes):
+            if result["success"]:
+                prepared["on_success"]()
+            results[idx] = result
+        pending.clear()
+        pending_ids.clear()
+
+    for idx, a in enumerate(actions):
+        out = _prepare_http(team_cfg, ctx, a)
+        if pending and ("payload" not in out or out["player_ids"] & pending_ids):
+            _flush()
+            out = _prepare_http(team_cfg, ctx, a)
+        if "payload" in out:
+            pending.append((idx, out))
+            pending_ids |= out["player_ids"]
+        else:
+            results[idx] = out
+    if pending:
+        _flush()
+
+    if any(r is not None and r["success"] for r in results):
+        invalidate(team_cfg)
+
+    return results  # type: ignore[return-value]
+
+
+def _dry_run_result(team_cfg: Dict[str, Any], action: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Describe what applying one action would do, without touching ESPN.
+    """
+    action_type = action.get("type", "")
+    msg = (
+        f"[DRY RUN] Would apply {action_type} for team "
+        f"{team_cfg.get('team_name_keyword')!r}: "
+        f"ADD {action.get('add_name', 'UNKNOWN')} / "
+        f"DROP {action.get('drop_name', 'UNKNOWN')} "
+        f"(+{action.get('gain', 0.0):.1f} pts)."
+    )
+    return {
+        "id": action.get("id", ""),
+        "type": action_type,
+        "mode": "dry_run",
+        "success": False,
+        "message": msg,
     }
 
 
+def dry_run_results(
+    team_cfg: Dict[str, Any], actions: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Dry-run results for a batch of actions; same shape as
+    apply_actions_for_team(..., mode="dry_run") but with no per-action mode
+    dispatch or ESPN session setup.
+    """
+    return [_dry_run_result(team_cfg, a) for a in actions]
+
+
 def apply_actions_for_team(
     team_cfg: Dict[str, Any],
     actions: List[Dict[str, Any]],
@@ -531,8 +689,9 @@ def apply_actions_for_team(
         One of the entries from config.TEAMS, containing ESPN league / auth
         info (league_id, season_year, espn_s2, espn_swid, etc.).
     actions:
-        List of action dictionaries, typically derived from SuggestedAction
-        models. Each action should at least have:
+        List of action dictionaries, as built by app._actions_from_state
+        (plain dicts shaped like SuggestedAction; no Pydantic models are
+        dumped on the way in). Each action should at least have:
           - id
           - type ("bench_to_start" | "fa_for_starter" | "fa_for_bench")
           - add_name, add_position
@@ -555,65 +714,19 @@ def apply_actions_for_team(
           - message     : human-readable summary
     """
 
-    results: List[Dict[str, Any]] = []
-
-    http_session: requests.Session | None = None
+    if mode == "http":
+        return _apply_http_batch(team_cfg, actions)
 
+    results: List[Dict[str, Any]] = []
     for a in actions:
-        action_id = a.get("id", "")
-        action_type = a.get("type", "")
-        add_name = a.get("add_name", "UNKNOWN")
-        drop_name = a.get("drop_name", "UNKNOWN")
-        gain = a.get("gain", 0.0)
-
         if mode == "dry_run":
-            msg = (
-                f"[DRY RUN] Would apply {action_type} for team "
-                f"{team_cfg.get('team_name_keyword')!r}: "
-                f"ADD {add_name} / DROP {drop_name} (+{gain:.1f} pts)."
-            )
-            results.append(
-                {
-                    "id": action_id,
-                    "type": action_type,
-                    "mode": mode,
-                    "success": False,
-                    "message": msg,
-                }
-            )
-        elif mode == "http":
-            # Lazily create a shared session for this batch.
-            if http_session is None:
-                http_session = _http_session_for_team(team_cfg)
-
-            if action_type == "bench_to_start":
-                result = _apply_bench_to_start_http(http_session, team_cfg, a)
-            elif action_type == "fa_for_bench":
-                result = _apply_fa_bench_http(http_session, team_cfg, a)
-            elif action_type == "fa_for_starter":
-                # For now, treat FA->starter as "add to bench, drop" and allow
-                # the optimizer / UI to promote them on the next run. This is
-                # safer than trying to manipulate lineup slots in the same
-                # transaction.
-                result = _apply_fa_bench_http(http_session, team_cfg, a)
-            else:
-                result = {
-                    "id": action_id,
-                    "type": action_type,
-                    "mode": mode,
-                    "success": False,
-                    "message": (
-                        "HTTP execution not implemented for this action type."
-                    ),
-                }
-
-            results.append(result)
+            results.append(_dry_run_result(team_cfg, a))
         else:
             # Placeholder for future "browser" mode or other strategies.
             results.append(
                 {
-                    "id": action_id,
-                    "type": action_type,
+                    "id": a.get("id", ""),
+                    "type": a.get("type", ""),
                     "mode": mode,
                     "success": False,
                     "message": "Execution mode not implemented yet.",
@@ -621,5 +734,3 @@ def apply_actions_for_team(
             )
 
     return results
-
-
@@ -3,7 +3,11 @@
 # Adapters to pull live data from ESPN and map it into LineupIQ models,
 # attaching FantasyPros weekly projections.
 
-from typing import List, Any, Optional
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Callable, List, Optional
 
 from espn_api.football import League  # type: ignore[import]
 
@@ -12,47 +16,190 @@ from config import (  # type: ignore[import]
     ESPN_YEAR,
     ESPN_S2,
     ESPN_SWID,
-    TEAMS,
+    get_teams,
     DEFAULT_TEAM_KEY,
     CURRENT_WEEK,
 )
-from models import Player, FreeAgent  # type: ignore[import]
+from models import Player, FreeAgent, Position  # type: ignore[import]
 from projections_fantasypros import (  # type: ignore[import]
-    get_fp_projection_for_espn_player,
+    get_fp_projections_bulk,
 )
+from ttl_cache import TTLCache  # type: ignore[import]
+
+log = logging.getLogger(__name__)
 
 
 # ---------- tiny helper so dicts & objects both work ----------
 
 def _cfg_get(cfg: Optional[Any], key: str, default=None):
     """
-    Read a config field whether cfg is a dict or a simple object.
+    Read a config field whether cfg is a mapping or a simple object.
     """
     if cfg is None:
         return default
-    if isinstance(cfg, dict):
+    if isinstance(cfg, Mapping):
         return cfg.get(key, default)
     return getattr(cfg, key, default)
 
 
+# Lineup slot codes that mean "not starting". espn_api can use "BE", "BN",
+# numeric bench codes, or "Bench".
+_BENCH_LIKE_SLOTS = frozenset({"BE", "BN", "IR", "RES", "BENCH"})
+
+
+# ---------- caches ----------
+#
+# Building a League costs several ESPN round-trips, and rosters / the FA pool
+# change on the order of minutes, so keep recent results in memory. Writes
+# through espn_actions call invalidate() so our own changes show up at once.
+#
+# Rosters and free agents are served stale-while-revalidate: an entry older
+# than *_REVALIDATE_AFTER_SECONDS is still returned immediately, while a
+# background thread fetches a fresh copy; only past the TTL does a caller
+# wait on ESPN.
+
+LEAGUE_CACHE_TTL_SECONDS = 60
+ROSTER_CACHE_TTL_SECONDS = 120
+ROSTER_REVALIDATE_AFTER_SECONDS = 30
+FREE_AGENT_CACHE_TTL_SECONDS = 900
+FREE_AGENT_REVALIDATE_AFTER_SECONDS = 120
+
+_league_cache = TTLCache(maxsize=64, ttl=LEAGUE_CACHE_TTL_SECONDS)
+_roster_cache = TTLCache(maxsize=64, ttl=ROSTER_CACHE_TTL_SECONDS)
+_free_agent_cache = TTLCache(maxsize=64, ttl=FREE_AGENT_CACHE_TTL_SECONDS)
+
+
+def _league_key(team_cfg: Optional[Any]) -> tuple:
+    return (
+        _cfg_get(team_cfg, "league_id", ESPN_LEAGUE_ID),
+        _cfg_get(team_cfg, "season_year", ESPN_YEAR),
+        _cfg_get(team_cfg, "espn_s2", ESPN_S2),
+        _cfg_get(team_cfg, "espn_swid", ESPN_SWID),
+    )
+
+
+# Bumped by invalidate(); a background refresh that started before an
+# invalidation must not write its (possibly pre-write) result back. The bump
+# and the refresh's compare-and-set both happen under _refreshing_lock.
+_generation = 0
+_refreshing: set = set()
+_refreshing_lock = threading.Lock()
+
+
+def invalidate(team_cfg: Optional[Any] = None) -> None:
+    """
+    Drop cached league / roster / free-agent data for this team's league
+    (everything, if team_cfg is None). Call after writing to ESPN.
+    """
+    global _generation
+    with _refreshing_lock:
+        _generation += 1
+    if team_cfg is None:
+        _league_cache.clear()
+        _roster_cache.clear()
+        _free_agent_cache.clear()
+        return
+    league_key = _league_key(team_cfg)
+    _league_cache.pop(league_key)
+    for cache in (_roster_cache, _free_agent_cache):
+        for key in cache.keys():
+            if key[0] == league_key:
+                cache.pop(key)
+
+
+def _revalidate_in_background(
+    cache: TTLCache, key: tuple, team_cfg: Optional[Any], load: Callable[[], Any]
+) -> None:
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+        generation = _generation
+
+    def _run() -> None:
+        try:
+            _league_cache.pop(_league_key(team_cfg))
+            value = load()
+            with _refreshing_lock:
+                if generation == _generation:
+                    cache.set(key, (time.monotonic(), value))
+        except Exception:  # pragma: no cover - network/IO
+            # key[0] is the league key, which carries the ESPN cookies; log
+            # only the league id / season and the rest of the key.
+            log.warning(
+                "Background refresh failed for %s",
+                key[0][:2] + key[1:],
+                exc_info=True,
+            )
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=_run, daemon=True).start()
+
+
+def _swr_get(
+    cache: TTLCache,
+    key: tuple,
+    revalidate_after: float,
+    team_cfg: Optional[Any],
+    load: Callable[[], Any],
+    allow_stale: bool,
+    force_refresh: bool,
+) -> Any:
+    """
+    Cached value for key, loading it if missing/expired. With allow_stale,
+    an entry older than revalidate_after is returned as-is and refreshed in
+    the background; without it, such an entry is reloaded inline. Either
+    way the reload fetches a new League. force_refresh always reloads.
+    """
+    reload_league = force_refresh
+    if not force_refresh:
+        entry = cache.get(key)
+        if entry is not None:
+            fetched_at, value = entry
+            if time.monotonic() - fetched_at < revalidate_after:
+                return value
+            if allow_stale:
+                _revalidate_in_background(cache, key, team_cfg, load)
+                return value
+            reload_league = True
+
+    # A refresh of data we already had must not be served from a League
+    # that is just as old.
+    if reload_league:
+        _league_cache.pop(_league_key(team_cfg))
+    value = load()
+    cache.set(key, (time.monotonic(), value))
+    return value
+
+
 # ---------- league helper ----------
 
-def _get_league(team_cfg: Optional[Any] = None) -> League:
+def _get_league(team_cfg: Optional[Any] = None, fresh: bool = False) -> League:
     """
     Build an ESPN League for a particular team config.
     If team_cfg is None, fall back to the single-team constants.
-    """
-    league_id = _cfg_get(team_cfg, "league_id", ESPN_LEAGUE_ID)
-    year = _cfg_get(team_cfg, "season_year", ESPN_YEAR)
-    espn_s2 = _cfg_get(team_cfg, "espn_s2", ESPN_S2)
-    swid = _cfg_get(team_cfg, "espn_swid", ESPN_SWID)
 
-    return League(
+    Leagues are cached for LEAGUE_CACHE_TTL_SECONDS; pass fresh=True to
+    always fetch a new one (and not share it), e.g. before writing.
+    """
+    key = _league_key(team_cfg)
+    if not fresh:
+        cached = _league_cache.get(key)
+        if cached is not None:
+            return cached
+
+    league_id, year, espn_s2, swid = key
+    league = League(
         league_id=league_id,
         year=year,
         espn_s2=espn_s2,
         swid=swid,
     )
+    if not fresh:
+        _league_cache.set(key, league)
+    return league
 
 
 def _find_my_team(league: League, team_cfg: Optional[Any]) -> Any:
@@ -79,58 +226,97 @@ def _find_my_team(league: League, team_cfg: Optional[Any]) -> Any:
 
 # ---------- roster + FA fetchers ----------
 
-def fetch_roster_from_espn(team_cfg: Optional[Any] = None) -> List[Player]:
+def _is_bye_week(p: Any) -> bool:
+    """
+    Detect bye weeks. In espn_api the schedule is usually a dict keyed by
+    scoring period / week number, so a missing entry for the current week
+    strongly indicates a bye (as with 49ers D/ST above). As a fallback, we
+    also inspect simple opponent-style fields for "BYE".
+    """
+    sched = getattr(p, "schedule", None)
+
+    if isinstance(sched, dict):
+        # For roster players, schedule will usually contain entries for
+        # most weeks; for BYE weeks the current week key is simply
+        # missing. For free agents, espn_api often exposes an empty dict
+        # for BYE weeks. In both cases "no CURRENT_WEEK key" means BYE.
+        return CURRENT_WEEK not in sched and str(CURRENT_WEEK) not in sched
+
+    opp_raw = getattr(p, "opponent", None) or getattr(p, "opp", None)
+    opp_str = str(opp_raw or "").upper()
+    return "BYE" in opp_str
+
+
+def fetch_roster_from_espn(
+    team_cfg: Optional[Any] = None,
+    allow_stale: bool = True,
+    force_refresh: bool = False,
+) -> List[Player]:
     """
     Return your current ESPN roster as LineupIQ Player objects,
     with projections coming from FantasyPros.
+
+    allow_stale / force_refresh control the cache; see _swr_get.
     """
-    league = _get_league(team_cfg)
-    my_team = _find_my_team(league, team_cfg)
+    cache_key = (
+        _league_key(team_cfg),
+        _cfg_get(team_cfg, "team_name_keyword"),
+        _cfg_get(team_cfg, "scoring"),
+    )
+    roster = _swr_get(
+        _roster_cache,
+        cache_key,
+        ROSTER_REVALIDATE_AFTER_SECONDS,
+        team_cfg,
+        lambda: _build_roster(team_cfg),
+        allow_stale,
+        force_refresh,
+    )
+    return list(roster)
 
-    roster: List[Player] = []
 
-    for p in my_team.roster:
-        # Detect bye weeks. In espn_api the schedule is usually a dict keyed
-        # by scoring period / week number, so a missing entry for the current
-        # week strongly indicates a bye (as with 49ers D/ST above). As a
-        # fallback, we also inspect simple opponent-style fields for "BYE".
-        sched = getattr(p, "schedule", None)
-        is_bye_week = False
-
-        if isinstance(sched, dict):
-            # For roster players, schedule will usually contain entries for
-            # most weeks; for BYE weeks the current week key is simply
-            # missing. For free agents, espn_api often exposes an empty dict
-            # for BYE weeks. In both cases "no CURRENT_WEEK key" means BYE.
-            if CURRENT_WEEK not in sched and str(CURRENT_WEEK) not in sched:
-                is_bye_week = True
-        else:
-            opp_raw = getattr(p, "opponent", None) or getattr(p, "opp", None)
-            opp_str = str(opp_raw or "").upper()
-            if "BYE" in opp_str:
-                is_bye_week = True
+def _build_roster(team_cfg: Optional[Any]) -> List[Player]:
+    league = _get_league(team_cfg)
+    my_team = _find_my_team(league, team_cfg)
 
-        # Weekly projection from FantasyPros. If the player is on bye, skip
-        # the lookup and use 0.0.
-        if is_bye_week:
-            proj = 0.0
-        else:
-            proj = get_fp_projection_for_espn_player(p.name, p.position, team_cfg)
+    espn_roster = list(my_team.roster)
+
+    # Read each field off the espn_api Player objects once, into aligned
+    # columns, and derive everything else from those.
+    names = [p.name for p in espn_roster]
+    positions = [p.position for p in espn_roster]
+    byes = [_is_bye_week(p) for p in espn_roster]
+    # Raw ESPN status info
+    raw_statuses = [
+        getattr(p, "injuryStatus", None) or getattr(p, "status", None)
+        for p in espn_roster
+    ]
+    # Normalise slot to a string for robust comparisons. This code is what
+    # you see in the ESPN UI, e.g. "RB", "WR", "RB/WR/TE", "FLEX", "BE".
+    # We also stash it on the Player objects so downstream logic (like
+    # bench→start swap suggestions) can respect which slots are FLEX and
+    # which are strict position slots.
+    slots = [
+        getattr(p, "slot_position", None)
+        or getattr(p, "slotPosition", None)
+        or getattr(p, "lineupSlot", None)
+        for p in espn_roster
+    ]
+    slot_strs = [str(slot).upper() if slot is not None else "" for slot in slots]
+
+    # Weekly projections from FantasyPros, looked up in one batch. Players on
+    # bye skip the lookup and use 0.0.
+    projections = get_fp_projections_bulk(
+        [(name, pos) for name, pos, bye in zip(names, positions, byes) if not bye],
+        team_cfg,
+    )
 
-        # Raw ESPN status info
-        raw_status = getattr(p, "injuryStatus", None) or getattr(p, "status", None)
-        slot = (
-            getattr(p, "slot_position", None)
-            or getattr(p, "slotPosition", None)
-            or getattr(p, "lineupSlot", None)
-        )
+    roster: List[Player] = []
 
-        # Normalise slot to a string for robust comparisons. This code is what
-        # you see in the ESPN UI, e.g. "RB", "WR", "RB/WR/TE", "FLEX", "BE".
-        # We also stash it on the Player objects so downstream logic (like
-        # bench→start swap suggestions) can respect which slots are FLEX and
-        # which are strict position slots.
-        slot_str = str(slot).upper() if slot is not None else ""
+    for name, position, is_bye_week, raw_status, slot_str in zip(
+        names, positions, byes, raw_statuses, slot_strs
+    ):
+        proj = 0.0 if is_bye_week else projections[(name, position)]
 
         # Final status:
         #  - BYE if opponent/schedule indicates a bye week
@@ -144,47 +330,63 @@ def fetch_roster_from_espn(team_cfg: Optional[Any] = None) -> List[Player]:
         else:
             status = raw_status if raw_status is not None else "ACTIVE"
 
-        # Starter flag: not bench / IR / reserve
-        # espn_api can use "BE", "BN", numeric bench codes, or "Bench"
-        bench_like_slots = {"BE", "BN", "IR", "RES", "BENCH"}
-        is_starter = slot_str not in bench_like_slots
-
-        # Normalize DST
-        pos = p.position
-        if pos in ("D/ST", "DST"):
-            pos = "DST"
-
         player = Player(
-            name=p.name,
-            position=pos,
+            name=name,
+            position=Position.from_str(position) or position,
             projection=proj or 0.0,
             status=status,
-            is_starter=is_starter,
+            # Starter flag: not bench / IR / reserve
+            is_starter=slot_str not in _BENCH_LIKE_SLOTS,
+            # The raw ESPN lineup slot code lets the optimizer reason about
+            # which starters are actually occupying FLEX ("RB/WR/TE") versus
+            # locked position slots like "RB" or "WR".
+            espn_slot=slot_str,
         )
 
-        # Attach the raw ESPN lineup slot code so the optimizer can reason
-        # about which starters are actually occupying FLEX ("RB/WR/TE") versus
-        # locked position slots like "RB" or "WR".
-        setattr(player, "espn_slot", slot_str)
-
         roster.append(player)
 
     return roster
 
 
 def fetch_free_agents_from_espn(
-    team_cfg: Optional[Any] = None, max_players: int = 50
+    team_cfg: Optional[Any] = None,
+    max_players: int = 50,
+    allow_stale: bool = True,
+    force_refresh: bool = False,
 ) -> List[FreeAgent]:
     """
     Return a list of free agents with projections.
     max_players limits how many we pull for performance.
+
+    allow_stale / force_refresh control the cache; see _swr_get.
     """
-    league = _get_league(team_cfg)
+    fa_key = (
+        _league_key(team_cfg),
+        CURRENT_WEEK,
+        max_players,
+        _cfg_get(team_cfg, "scoring"),
+    )
+    free_agents = _swr_get(
+        _free_agent_cache,
+        fa_key,
+        FREE_AGENT_REVALIDATE_AFTER_SECONDS,
+        team_cfg,
+        lambda: _build_free_agents(team_cfg, max_players),
+        allow_stale,
+        force_refresh,
+    )
+    return list(free_agents)
 
-    fa_players = league.free_agents(size=max_players)
+
+def _build_free_agents(team_cfg: Optional[Any], max_players: int) -> List[FreeAgent]:
+    fa_players = _get_league(team_cfg).free_agents(size=max_players)
 
     free_agents: List[FreeAgent] = []
 
+    projections = get_fp_projections_bulk(
+        [(p.name, p.position) for p in fa_players], team_cfg
+    )
+
     for p in fa_players:
         # For free agents, espn_api does not reliably expose schedule / bye-week
         # information (often schedule is just an empty dict and status is None),
@@ -193,15 +395,13 @@ def fetch_free_agents_from_espn(
         raw_status = getattr(p, "injuryStatus", None) or getattr(p, "status", None)
         status = raw_status if raw_status is not None else "ACTIVE"
 
-        proj = get_fp_projection_for_espn_player(p.name, p.position, team_cfg)
+        proj = projections[(p.name, p.position)]
 
         # Availability: treat WA/WAIVER as "cannot add now"
         availability = (getattr(p, "status", "") or "").upper()
         can_add_now = not ("WA" in availability or "WAIVER" in availability)
 
-        pos = p.position
-        if pos in ("D/ST", "DST"):
-            pos = "DST"
+        pos = Position.from_str(p.position) or p.position
 
         free_agents.append(
             FreeAgent(
@@ -218,8 +418,8 @@ def fetch_free_agents_from_espn(
 
 # Convenience for single-team CLI call, still works:
 def fetch_default_roster() -> List[Player]:
-    return fetch_roster_from_espn(TEAMS.get(DEFAULT_TEAM_KEY))
+    return fetch_roster_from_espn(get_teams().get(DEFAULT_TEAM_KEY))
 
 
 def fetch_default_free_agents(max_players: int = 50) -> List[FreeAgent]:
-    return fetch_free_agents_from_espn(TEAMS.get(DEFAULT_TEAM_KEY), max_players=max_players)
+    return fetch_free_agents_from_espn(get_teams().get(DEFAULT_TEAM_KEY), max_players=max_players)
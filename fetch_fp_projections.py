@@ -4,8 +4,11 @@
 # and store them in a week-organized folder under /data.
 
 import requests  # type: ignore[import]
+import functools
 import os
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Optional
 
 # ================================
 # CONFIG
@@ -20,6 +23,9 @@ USER_AGENT_HEADER = {
     "User-Agent": "Mozilla/5.0"
 }
 
+# Approx NFL kickoff window, as a day number (date.toordinal()).
+_SEASON_START_ORDINAL = date(SEASON_YEAR, 9, 5).toordinal()
+
 # ================================
 # UTILITIES
 # ================================
@@ -29,26 +35,30 @@ def detect_current_nfl_week() -> int:
     Rough NFL week estimation based on season start heuristics.
     You can override manually if needed.
     """
-    season_start = datetime(SEASON_YEAR, 9, 5)   # approx NFL kickoff window
-    today = datetime.now()
+    return _nfl_week_for(date.today())
 
-    delta_days = (today - season_start).days
-    week = max(1, min(18, (delta_days // 7) + 1))
 
-    return week
+# Keyed on the date, so a long-running server picks up the new week the day
+# it changes while every other call is a cache hit.
+@functools.lru_cache(maxsize=1)
+def _nfl_week_for(today: date) -> int:
+    delta_days = today.toordinal() - _SEASON_START_ORDINAL
+    return max(1, min(18, delta_days // 7 + 1))
 
 
 def ensure_folder(path: str):
     os.makedirs(path, exist_ok=True)
 
 
-def download_projection_file(pos: str, outfile: str):
+def download_projection_file(
+    pos: str, outfile: str, session: Optional[requests.Session] = None
+):
     url = BASE_URL.format(pos=pos)
     params = {"scoring": SCORING}
 
     print(f"Downloading {pos.upper()} projections...")
 
-    resp = requests.get(
+    resp = (session or requests).get(
         url,
         headers=USER_AGENT_HEADER,
         params=params,
@@ -57,8 +67,13 @@ def download_projection_file(pos: str, outfile: str):
 
     resp.raise_for_status()
 
-    with open(outfile, "wb") as f:
+    # Write to a temp file and swap it in: readers never see a half-written
+    # file, and the rename bumps the folder mtime, which is how a running
+    # projections_fantasypros notices a re-download.
+    tmp_path = outfile + ".tmp"
+    with open(tmp_path, "wb") as f:
         f.write(resp.content)
+    os.replace(tmp_path, outfile)
 
     print(f"Saved -> {outfile}")
 
@@ -86,17 +101,36 @@ def main():
     print(f"Output: {target_dir}")
     print("==========================================\n")
 
-    for pos in POSITIONS:
-        filename = f"{pos}.xls"
-        save_path = os.path.join(target_dir, filename)
+    # The per-position downloads are independent, so fetch them in parallel
+    # over one shared Session (reusing the connection to fantasypros.com).
+    # A failure only affects its own position.
+    with requests.Session() as session:
+
+        def _download(pos: str) -> Optional[Exception]:
+            save_path = os.path.join(target_dir, f"{pos}.xls")
+            try:
+                download_projection_file(pos, save_path, session=session)
+            except Exception as e:
+                return e
+            return None
+
+        with ThreadPoolExecutor(max_workers=len(POSITIONS)) as pool:
+            errors = list(pool.map(_download, POSITIONS))
 
-        try:
-            download_projection_file(pos, save_path)
-        except Exception as e:
-            print(f"❌ Failed downloading {pos.upper()}: {e}")
+    for pos, err in zip(POSITIONS, errors):
+        if err is not None:
+            print(f"❌ Failed downloading {pos.upper()}: {err}")
 
     print("\n✅ FantasyPros downloads complete.")
 
 
 if __name__ == "__main__":
+    import logging
+
+    # Modules log through logging.getLogger(__name__). Set
+    # LINEUPIQ_LOG_LEVEL=WARNING to silence the routine load messages.
+    logging.basicConfig(
+        level=os.environ.get("LINEUPIQ_LOG_LEVEL", "INFO").upper(),
+        format="%(message)s",
+    )
     main()
@@ -10,21 +10,27 @@
 
 from __future__ import annotations
 
-from typing import List, Tuple, Optional, Dict, Any
+import heapq
+import math
+import os
+import sys
+from collections import defaultdict
+from operator import attrgetter, itemgetter
+from typing import List, Tuple, Optional, Dict, Any, Set
 
 from models import Player, Slot, Assignment, FreeAgent  # type: ignore[import]
 from espn_adapter import (  # type: ignore[import]
     fetch_roster_from_espn,
     fetch_free_agents_from_espn,
 )
-from config import TEAMS, DEFAULT_TEAM_KEY  # type: ignore[import]
+from config import get_teams, DEFAULT_TEAM_KEY  # type: ignore[import]
 
 # ---------------------------------------------------------------------------
 # Constants / helpers
 # ---------------------------------------------------------------------------
 
 # Players in these statuses (or with 0 proj) are treated as "stash", not droppable.
-STASH_STATUSES = {
+STASH_STATUSES = frozenset({
     "O",
     "OUT",
     "BYE",
@@ -32,16 +38,35 @@ STASH_STATUSES = {
     "DOUBTFUL",
     "IR",
     "INJURY_RESERVE",
-}
+})
 
 # “Healthy enough” to be considered for starting / dropping
-HEALTHY_STATUSES = {
+HEALTHY_STATUSES = frozenset({
     "ACTIVE",
     "NORMAL",
     "QUESTIONABLE",  # you can adjust this if you’d rather stash Q as well
-}
+})
+
+FLEX_ELIGIBLE = frozenset({"RB", "WR", "TE"})
+
+# Sort keys: a suggestion tuple's gain, and a player's projection.
+_GAIN = itemgetter(2)
+_PROJ = attrgetter("projection")
+
+# Lineup slots whose FLEX-eligible starters compete for the FLEX slot in
+# optimize_lineup's post-pass.
+_FLEX_POOL_SLOTS = frozenset({"RB1", "RB2", "WR1", "WR2", "TE", "FLEX"})
+
+# Set LINEUP_EXACT=1 to have suggest_fa_starter_upgrades re-run the full
+# optimizer for every free agent instead of the incremental insertion check
+# (slower; useful for validating the latter).
+LINEUP_EXACT = os.environ.get("LINEUP_EXACT") == "1"
 
-FLEX_ELIGIBLE = {"RB", "WR", "TE"}
+
+# Slot code -> label shown for current starters. Only the FLEX-style codes are
+# listed; every other code maps to its upper-cased self. Read-only: it's shared
+# across request threads.
+_FRIENDLY_SLOT: Dict[str, str] = {"RB/WR/TE": "FLEX", "RB/WR": "FLEX", "FLEX": "FLEX"}
 
 
 def _friendly_slot_name_for_starter(p: Player) -> str:
@@ -52,51 +77,78 @@ def _friendly_slot_name_for_starter(p: Player) -> str:
     and normalise FLEX-style codes like 'RB/WR/TE' to the simpler 'FLEX'
     so it's obvious in the UI which starter is occupying the flex slot.
     """
-    code = getattr(p, "espn_slot", None) or p.position or ""
-    code_up = str(code).upper()
-    if code_up in {"RB/WR/TE", "RB/WR", "FLEX"}:
-        return "FLEX"
-    return code_up
+    code = str(p.espn_slot or p.position or "")
+    return _FRIENDLY_SLOT.get(code) or _FRIENDLY_SLOT.get(code.upper(), code.upper())
+
+
+# Positions each ESPN lineup slot code can legally hold. This encodes the Flex
+# rules the ESPN UI enforces:
+#   - RB/WR/TE/FLEX slots can take any of RB, WR, TE
+#   - pure RB / WR / TE slots only accept that position
+#   - DST and K are isolated
+#   - OP (offensive player) can take any non-DST, non-K position
+_RB_ONLY = frozenset({"RB"})
+_WR_ONLY = frozenset({"WR"})
+_DST_ONLY = frozenset({"DST"})
+_FLEX_ALLOWED = FLEX_ELIGIBLE
+_OP_ALLOWED = frozenset({"QB", "RB", "WR", "TE"})
+
+_SLOT_ALLOWED: Dict[str, frozenset] = {
+    "QB": frozenset({"QB"}),
+    "RB": _RB_ONLY,
+    "RB1": _RB_ONLY,
+    "RB2": _RB_ONLY,
+    "WR": _WR_ONLY,
+    "WR1": _WR_ONLY,
+    "WR2": _WR_ONLY,
+    "TE": frozenset({"TE"}),
+    "DST": _DST_ONLY,
+    "D/ST": _DST_ONLY,
+    "K": frozenset({"K"}),
+    "FLEX": _FLEX_ALLOWED,
+    "RB/WR": _FLEX_ALLOWED,
+    "RB/WR/TE": _FLEX_ALLOWED,
+    "OP": _OP_ALLOWED,
+    "SUPERFLEX": _OP_ALLOWED,
+}
+
 
-def _slot_allows_position(slot_code: str, position: str) -> bool:
+def _allowed_positions(slot_code: str) -> frozenset:
     """
-    Return True if a given ESPN lineup slot code can legally hold a player at
-    `position`.
-
-    This is stricter than just comparing positions – it encodes the Flex
-    rules the ESPN UI enforces:
-      - RB/WR/TE/FLEX slots can take any of RB, WR, TE
-      - pure RB / WR / TE slots only accept that position
-      - DST and K are isolated
-      - OP (offensive player) can take any non-DST, non-K position
+    Positions a given ESPN lineup slot code can legally hold (see
+    _SLOT_ALLOWED). If we don't recognise the slot code, only an exact
+    position match is allowed.
     """
     slot = (slot_code or "").upper()
-    pos = position.upper()
-
-    if slot in {"RB", "RB1", "RB2"}:
-        return pos == "RB"
-    if slot in {"WR", "WR1", "WR2"}:
-        return pos == "WR"
-    if slot in {"TE"}:
-        return pos == "TE"
-    if slot in {"DST", "D/ST"}:
-        return pos == "DST"
-    if slot in {"K"}:
-        return pos == "K"
-    if slot in {"FLEX", "RB/WR", "RB/WR/TE"}:
-        return pos in FLEX_ELIGIBLE
-    if slot in {"OP", "SUPERFLEX"}:
-        # Allow any offensive position in generic OP slot.
-        return pos in {"QB", "RB", "WR", "TE"}
-
-    # Fallback: if we don't recognise the slot code, require exact match.
-    return slot == pos
+    allowed = _SLOT_ALLOWED.get(slot)
+    return allowed if allowed is not None else frozenset((slot,))
 
 
 def _status(p: Player) -> str:
+    # run_lineup_for_team stashes the upper-cased status on each roster player
+    # once, so the optimizer / suggester loops don't re-normalise it.
+    cached = p._status_cached
+    if cached is not None:
+        return cached
     return (p.status or "").upper()
 
 
+def _fa_status(fa: FreeAgent) -> str:
+    return (getattr(fa, "status", "") or "").upper()
+
+
+def _usable_free_agents(free_agents: List[FreeAgent]) -> List[FreeAgent]:
+    """
+    Free agents worth suggesting at all: projection > 0, and never on BYE (or
+    explicitly marked as stash). Both FA suggesters expect this filtered list.
+    """
+    return [
+        fa
+        for fa in free_agents
+        if fa.projection > 0 and _fa_status(fa) not in STASH_STATUSES
+    ]
+
+
 def _player_to_dict(p: Player) -> Dict[str, Any]:
     """
     Convert a Player dataclass into a JSON-serializable dict suitable for the API.
@@ -140,59 +192,110 @@ def eligible(player: Player, slot: Slot) -> bool:
     return player.position in slot.eligible_positions
 
 
-def optimize_lineup(players: List[Player], slots: List[Slot]) -> Tuple[List[Assignment], List[Player]]:
-    """
-    Simple greedy optimizer:
-    - ignores players with stash statuses or 0 projection
-    - fills each slot in order with highest-projection eligible player
-    """
-    usable = [
+def _usable_players(players: List[Player]) -> List[Player]:
+    """Players the optimizer may start: no stash statuses, projection > 0."""
+    return [
         p
         for p in players
         if p.projection > 0 and _status(p) not in STASH_STATUSES
     ]
 
-    remaining = usable.copy()
-    starters: List[Assignment] = []
 
+def _fill_slots(usable: List[Player], slots: List[Slot]) -> List[Optional[int]]:
+    """
+    Greedy slot fill: each slot, in order, takes the highest-projection
+    eligible player still available (ties go to the earlier player). Returns
+    the index into `usable` picked for each slot, or None if it stays empty.
+
+    This works on (projection, index) keys only; optimize_lineup and the FA
+    insertion check map the indices back to Player objects.
+    """
+    # Bucket usable players by position into max-heaps keyed on projection
+    # (ties go to the earlier player, as a linear scan would). Each slot then
+    # only peeks the top of the buckets it accepts.
+    buckets: Dict[str, List[Tuple[float, int]]] = {}
+    for idx, p in enumerate(usable):
+        buckets.setdefault(p.position, []).append((-p.projection, idx))
+    for bucket in buckets.values():
+        heapq.heapify(bucket)
+
+    picks: List[Optional[int]] = []
     for slot in slots:
-        best: Optional[Player] = None
-        for p in remaining:
-            if eligible(p, slot):
-                if best is None or p.projection > best.projection:
-                    best = p
-
-        if best is not None:
-            starters.append(Assignment(slot, best))
-            remaining.remove(best)
+        best_bucket: Optional[List[Tuple[float, int]]] = None
+        for pos in slot.eligible_positions:
+            bucket = buckets.get(pos)
+            if bucket and (best_bucket is None or bucket[0] < best_bucket[0]):
+                best_bucket = bucket
+
+        if best_bucket is not None:
+            picks.append(heapq.heappop(best_bucket)[1])
         else:
-            starters.append(Assignment(slot, None))
+            picks.append(None)
+
+    return picks
+
+
+def _bumped_by_insertion(
+    usable: List[Player],
+    picks: List[Optional[int]],
+    slots: List[Slot],
+    newcomer: Player,
+) -> Optional[Player]:
+    """
+    The starter that `newcomer` would push out of the lineup if it were
+    appended to `usable` and the greedy fill re-run, given that fill's `picks`
+    for `usable` alone. None if the newcomer wouldn't start or would only
+    fill an empty slot.
+
+    Adding one player changes the fill along a single path: walking the slots
+    in order, whoever is "left over" (first the newcomer, then anyone it
+    displaces) takes a slot only if it beats that slot's original pick, and
+    that pick becomes the one left over. So this is one O(S) walk rather than
+    a full re-optimization.
+    """
+    carry = newcomer
+    carry_key = (-newcomer.projection, len(usable))  # loses ties: appended last
+    for slot, idx in zip(slots, picks):
+        if not eligible(carry, slot):
+            continue
+        if idx is None:
+            return None
+        occupant_key = (-usable[idx].projection, idx)
+        if carry_key < occupant_key:
+            carry, carry_key = usable[idx], occupant_key
+
+    return None if carry is newcomer else carry
+
+
+def optimize_lineup(players: List[Player], slots: List[Slot]) -> Tuple[List[Assignment], List[Player]]:
+    """
+    Simple greedy optimizer:
+    - ignores players with stash statuses or 0 projection
+    - fills each slot in order with highest-projection eligible player
+    """
+    usable = _usable_players(players)
+    if not usable:
+        return [Assignment(slot, None) for slot in slots], []
+
+    picks = _fill_slots(usable, slots)
+    # While building the assignments, note the FLEX slot and collect all
+    # FLEX-eligible starters across RB/WR/TE/FLEX slots for the post-pass.
+    starters: List[Assignment] = [None] * len(slots)  # type: ignore[list-item]
+    flex_idx: Optional[int] = None
+    flex_candidates: List[Tuple[int, Player]] = []
+    for idx, (slot, pick) in enumerate(zip(slots, picks)):
+        p = usable[pick] if pick is not None else None
+        starters[idx] = Assignment(slot, p)
+        if slot.name == "FLEX":
+            flex_idx = idx
+        if p is not None and p.position in FLEX_ELIGIBLE and slot.name in _FLEX_POOL_SLOTS:
+            flex_candidates.append((idx, p))
 
     # Post-process starters so that, when possible, the *lowest* projection
     # FLEX-eligible starter (RB/WR/TE) occupies the FLEX slot. This mirrors the
     # way savvy managers use FLEX and makes downstream swap logic easier to
     # reason about.
-    slot_name_to_index: Dict[str, int] = {
-        a.slot.name: idx for idx, a in enumerate(starters)
-    }
-    flex_idx = slot_name_to_index.get("FLEX")
     if flex_idx is not None and starters[flex_idx].player is not None:
-        # Collect all FLEX-eligible starters across RB/WR/TE/FLEX slots.
-        flex_candidates: List[Tuple[int, Player]] = []
-        for idx, a in enumerate(starters):
-            p = a.player
-            if p is None:
-                continue
-            if p.position in FLEX_ELIGIBLE and a.slot.name in {
-                "RB1",
-                "RB2",
-                "WR1",
-                "WR2",
-                "TE",
-                "FLEX",
-            }:
-                flex_candidates.append((idx, p))
-
         if len(flex_candidates) >= 2:
             # Find the lowest-projection FLEX-eligible starter.
             min_idx, min_player = min(
@@ -213,7 +316,8 @@ def optimize_lineup(players: List[Player], slots: List[Slot]) -> Tuple[List[Assi
                         starters[flex_idx].player,
                     )
 
-    bench = remaining
+    taken = set(picks)
+    bench = [p for idx, p in enumerate(usable) if idx not in taken]
     return starters, bench
 
 
@@ -222,7 +326,12 @@ def optimize_lineup(players: List[Player], slots: List[Slot]) -> Tuple[List[Assi
 # ---------------------------------------------------------------------------
 
 
-def suggest_bench_start_swaps(players: List[Player], slots: List[Slot]) -> List[Tuple[Player, Player, float]]:
+def suggest_bench_start_swaps(
+    players: List[Player],
+    slots: List[Slot],
+    *,
+    optimal_assignments: Optional[List[Assignment]] = None,
+) -> List[Tuple[Player, Player, float]]:
     """
     Compare:
       - your *current* starters (is_starter=True)
@@ -234,14 +343,22 @@ def suggest_bench_start_swaps(players: List[Player], slots: List[Slot]) -> List[
       - promotes healthy bench players
       - demotes healthy starters
       - uses same-position swaps, except FLEX (RB/WR/TE only).
+
+    optimal_assignments: optimize_lineup(players, slots)'s assignments, if
+    the caller already has them.
     """
     base_starters = [p for p in players if p.is_starter]
 
-    optimal_assignments, _ = optimize_lineup(players, slots)
+    if optimal_assignments is None:
+        optimal_assignments, _ = optimize_lineup(players, slots)
     optimal_starters = [a.player for a in optimal_assignments if a.player is not None]
 
-    promoted = [p for p in optimal_starters if p not in base_starters]
-    demoted = [p for p in base_starters if p not in optimal_starters]
+    # Player dataclasses are unhashable, but these lists all hold the same
+    # roster instances, so membership is tracked by identity via id().
+    base_ids = {id(p) for p in base_starters}
+    optimal_ids = {id(p) for p in optimal_starters}
+    promoted = [p for p in optimal_starters if id(p) not in base_ids]
+    demoted = [p for p in base_starters if id(p) not in optimal_ids]
 
     suggestions: List[Tuple[Player, Player, float]] = []
 
@@ -258,7 +375,12 @@ def suggest_bench_start_swaps(players: List[Player], slots: List[Slot]) -> List[
     # NOTE: we intentionally allow IR/BYE/OUT starters here (projection may be
     # 0.0). If you accidentally left an injured player in your lineup, we want
     # to suggest benching them in favour of a healthy bench option.
-    demoted_healthy: List[Player] = list(demoted)
+    # Each entry pairs the starter with the positions their ESPN slot allows,
+    # resolved once here rather than per bench player in the loops below.
+    demoted_healthy: List[Tuple[Player, frozenset]] = [
+        (d, _allowed_positions(d.espn_slot)) for d in demoted
+    ]
+    allowed_by_starter = {id(d): allowed for d, allowed in demoted_healthy}
 
     for bench_player in promoted:
         if bench_player is None:
@@ -271,25 +393,25 @@ def suggest_bench_start_swaps(players: List[Player], slots: List[Slot]) -> List[
         # legally hold the bench player's position. This prevents illegal
         # swaps like putting a WR directly into a pure RB slot; those swaps
         # are only valid when the starter is actually occupying FLEX.
-        candidates: List[Player] = []
-        for d in demoted_healthy:
-            slot_code = getattr(d, "espn_slot", "")
-            if _slot_allows_position(slot_code, bench_player.position):
-                candidates.append(d)
+        bench_pos = bench_player.position.upper()
+        candidates: List[Player] = [
+            d for d, allowed in demoted_healthy if bench_pos in allowed
+        ]
 
         if not candidates:
             # No legal single-step swap that respects ESPN's slot rules.
             continue
 
-        starter_to_sit = min(candidates, key=lambda x: x.projection)
+        starter_to_sit = min(candidates, key=_PROJ)
         gain = bench_player.projection - starter_to_sit.projection
         if gain > 0.5:  # small threshold to avoid noise
             suggestions.append((bench_player, starter_to_sit, gain))
             # Do not suggest benching the same starter multiple times; once
             # we've assigned this demotion, remove them from the pool so other
             # bench players can look for different opportunities (e.g. FLEX).
-            if starter_to_sit in demoted_healthy:
-                demoted_healthy.remove(starter_to_sit)
+            demoted_healthy = [
+                entry for entry in demoted_healthy if entry[0] is not starter_to_sit
+            ]
 
     # Fallback: if there are still demoted starters who are BYE / 0-proj / stash
     # but did not get a suggested swap from the optimized lineup, ensure we
@@ -297,14 +419,13 @@ def suggest_bench_start_swaps(players: List[Player], slots: List[Slot]) -> List[
     # at the *same slot*. This covers simple cases like "BYE RB in RB slot with
     # a healthy RB on the bench", even when the global optimizer prefers to
     # reshuffle other positions (e.g. using a WR in FLEX instead).
-    # Track which bench players/starters we've already used in suggestions.
-    # Use simple lists instead of sets because Player dataclasses are
-    # unhashable by default (eq=True, frozen=False).
-    used_bench: List[Player] = [bp for (bp, _sp, _g) in suggestions]
-    used_starters: List[Player] = [sp for (_bp, sp, _g) in suggestions]
+    # Track which bench players/starters we've already used in suggestions
+    # (by id(), as above).
+    used_bench_ids: Set[int] = {id(bp) for (bp, _sp, _g) in suggestions}
+    used_starter_ids: Set[int] = {id(sp) for (_bp, sp, _g) in suggestions}
 
     for starter in demoted:
-        if starter in used_starters:
+        if id(starter) in used_starter_ids:
             continue
 
         # If the starter is healthy with a real projection, we only want to
@@ -313,33 +434,31 @@ def suggest_bench_start_swaps(players: List[Player], slots: List[Slot]) -> List[
         if _status(starter) in HEALTHY_STATUSES and starter.projection > 0:
             continue
 
-        slot_code = getattr(starter, "espn_slot", "")
+        allowed = allowed_by_starter[id(starter)]
 
         candidates: List[Player] = []
         for p in players:
             if p.is_starter:
                 continue
-            if p in used_bench:
+            if id(p) in used_bench_ids:
                 continue
             if _status(p) not in HEALTHY_STATUSES or p.projection <= 0:
                 continue
-            if not _slot_allows_position(slot_code, p.position):
+            if p.position.upper() not in allowed:
                 continue
             candidates.append(p)
 
         if not candidates:
             continue
 
-        best_bench = max(candidates, key=lambda x: x.projection)
+        best_bench = max(candidates, key=_PROJ)
         gain = best_bench.projection - starter.projection
         if gain > 0.5:
             suggestions.append((best_bench, starter, gain))
-            if best_bench not in used_bench:
-                used_bench.append(best_bench)
-            if starter not in used_starters:
-                used_starters.append(starter)
+            used_bench_ids.add(id(best_bench))
+            used_starter_ids.add(id(starter))
 
-    suggestions.sort(key=lambda t: t[2], reverse=True)
+    suggestions.sort(key=_GAIN, reverse=True)
     return suggestions
 
 
@@ -352,23 +471,49 @@ def suggest_fa_starter_upgrades(
     players: List[Player],
     slots: List[Slot],
     free_agents: List[FreeAgent],
+    *,
+    base_assignments: Optional[List[Assignment]] = None,
 ) -> List[Tuple[FreeAgent, Player, float]]:
     """
-    For each free agent:
+    For each free agent (from _usable_free_agents):
       - Imagine adding them to your roster and re-running the optimizer
+        (computed incrementally; LINEUP_EXACT=1 really re-runs it)
       - If they make the optimal starting lineup, see which *healthy* starter they bump
       - Only suggest like-for-like (with FLEX logic)
+
+    base_assignments: optimize_lineup(players, slots)'s assignments, if the
+    caller already has them (only the LINEUP_EXACT path needs them).
     """
-    base_assignments, _ = optimize_lineup(players, slots)
-    base_starters = [a.player for a in base_assignments if a.player is not None]
+    if LINEUP_EXACT:
+        if base_assignments is None:
+            base_assignments, _ = optimize_lineup(players, slots)
+        base_starters = [a.player for a in base_assignments if a.player is not None]
+    else:
+        usable = _usable_players(players)
+        picks = _fill_slots(usable, slots)
+        base_starters = [usable[idx] for idx in picks if idx is not None]
+
+    # An FA can only bump a base starter at its own position (or, for RB/WR/TE,
+    # one in the FLEX pool), so unless it beats the weakest of those by the
+    # 0.5 margin below it can be skipped before any lineup work.
+    min_start_proj_by_pos: Dict[str, float] = {}
+    for p in base_starters:
+        prev = min_start_proj_by_pos.get(p.position)
+        if prev is None or p.projection < prev:
+            min_start_proj_by_pos[p.position] = p.projection
+    min_flex_proj = min(
+        (proj for pos, proj in min_start_proj_by_pos.items() if pos in FLEX_ELIGIBLE),
+        default=math.inf,
+    )
 
     upgrades: List[Tuple[FreeAgent, Player, float]] = []
 
     for fa in free_agents:
-        if fa.projection <= 0:
-            continue
-        # Never suggest FAs who are on BYE (or explicitly marked as stash).
-        if _status(Player(fa.name, fa.position, fa.projection, fa.status)) in STASH_STATUSES:
+        fa_is_flex = fa.position in FLEX_ELIGIBLE
+        threshold = min_start_proj_by_pos.get(fa.position, math.inf)
+        if fa_is_flex:
+            threshold = min(threshold, min_flex_proj)
+        if fa.projection - threshold <= 0.5:
             continue
 
         fa_player = Player(
@@ -378,15 +523,23 @@ def suggest_fa_starter_upgrades(
             status="ACTIVE",
             is_starter=False,
         )
+        fa_player._status_cached = "ACTIVE"
 
-        roster_plus = players + [fa_player]
-        new_assignments, _ = optimize_lineup(roster_plus, slots)
-        new_starters = [a.player for a in new_assignments if a.player is not None]
+        if LINEUP_EXACT:
+            roster_plus = players + [fa_player]
+            new_assignments, _ = optimize_lineup(roster_plus, slots)
+            new_starters = [a.player for a in new_assignments if a.player is not None]
 
-        if fa_player not in new_starters:
-            continue
+            new_ids = {id(p) for p in new_starters}
+            if id(fa_player) not in new_ids:
+                continue
 
-        bumped = [p for p in base_starters if p not in new_starters and p is not None]
+            bumped = [p for p in base_starters if id(p) not in new_ids]
+        else:
+            bumped_player = _bumped_by_insertion(usable, picks, slots, fa_player)
+            if bumped_player is None:
+                continue
+            bumped = [bumped_player]
 
         # Only bump healthy, non-stash players
         bumped_healthy = [
@@ -401,19 +554,19 @@ def suggest_fa_starter_upgrades(
         same_pos = [p for p in bumped_healthy if p.position == fa.position]
         if same_pos:
             candidates = same_pos
-        elif fa.position in FLEX_ELIGIBLE:
+        elif fa_is_flex:
             flex_candidates = [p for p in bumped_healthy if p.position in FLEX_ELIGIBLE]
             candidates = flex_candidates
 
         if not candidates:
             continue
 
-        bumped_player = min(candidates, key=lambda x: x.projection)
+        bumped_player = min(candidates, key=_PROJ)
         gain = fa.projection - bumped_player.projection
         if gain > 0.5:
             upgrades.append((fa, bumped_player, gain))
 
-    upgrades.sort(key=lambda t: t[2], reverse=True)
+    upgrades.sort(key=_GAIN, reverse=True)
     return upgrades
 
 
@@ -427,7 +580,7 @@ def suggest_fa_bench_upgrades(
     free_agents: List[FreeAgent],
 ) -> List[Tuple[FreeAgent, Player, float]]:
     """
-    Compare free agents against your *bench only*.
+    Compare free agents (from _usable_free_agents) against your *bench only*.
     - Bench players that are IR / OUT / BYE / 0-proj are treated as stash, not droppable
     - Like-for-like position, with FLEX RB/WR/TE sharing a pool
     """
@@ -440,33 +593,34 @@ def suggest_fa_bench_upgrades(
         and p.projection > 0
     ]
 
+    # The drop candidate for an FA only depends on its position, so find the
+    # worst droppable player per position (and across the FLEX pool) up front.
+    by_pos: Dict[str, List[Player]] = defaultdict(list)
+    for p in droppable_bench:
+        by_pos[p.position].append(p)
+    worst_by_pos = {
+        pos: min(group, key=_PROJ) for pos, group in by_pos.items()
+    }
+    # FLEX RB/WR/TE share one pool; otherwise strict same-position. Folding the
+    # FLEX pool into the table leaves the FA loop a single lookup, no branch.
+    drop_target = worst_by_pos
+    flex_group = [p for p in droppable_bench if p.position in FLEX_ELIGIBLE]
+    if flex_group:
+        worst_flex = min(flex_group, key=_PROJ)
+        drop_target.update(dict.fromkeys(FLEX_ELIGIBLE, worst_flex))
+
     upgrades: List[Tuple[FreeAgent, Player, float]] = []
 
     for fa in free_agents:
-        if fa.projection <= 0:
-            continue
-        # Never suggest FAs who are on BYE (or explicitly marked as stash).
-        if _status(Player(fa.name, fa.position, fa.projection, fa.status)) in STASH_STATUSES:
-            continue
-
-        # Strict same-position comparison first
-        comparable = [p for p in droppable_bench if p.position == fa.position]
-
-        # FLEX logic
-        if fa.position in FLEX_ELIGIBLE:
-            flex_group = [p for p in droppable_bench if p.position in FLEX_ELIGIBLE]
-            if flex_group:
-                comparable = flex_group
-
-        if not comparable:
+        worst = drop_target.get(fa.position)
+        if worst is None:
             continue
 
-        worst = min(comparable, key=lambda p: p.projection)
         gain = fa.projection - worst.projection
         if gain > 0.5:
             upgrades.append((fa, worst, gain))
 
-    upgrades.sort(key=lambda t: t[2], reverse=True)
+    upgrades.sort(key=_GAIN, reverse=True)
     return upgrades
 
 
@@ -504,43 +658,49 @@ def run_lineup_for_team(
       - fa_starter_upgrades: list of {"fa": {...}, "bumped": {...}, "gain": float, "can_add_now": bool}
       - fa_bench_upgrades: list of {"fa": {...}, "drop": {...}, "gain": float, "can_add_now": bool}
     """
-    if team_cfg_override is None and team_key not in TEAMS:
+    if team_cfg_override is None and team_key not in get_teams():
         raise KeyError(f"Unknown team key: {team_key}")
 
-    team_cfg = team_cfg_override or TEAMS[team_key]
+    team_cfg = team_cfg_override or get_teams()[team_key]
 
     roster: List[Player] = fetch_roster_from_espn(team_cfg)
     free_agents: List[FreeAgent] = fetch_free_agents_from_espn(team_cfg, max_players=50)
 
     slots = _default_slots()
 
-    # Base (ESPN) starters from your current lineup
-    base_starters_players: List[Player] = [p for p in roster if p.is_starter]
-    base_total_points = sum(p.projection for p in base_starters_players)
-
-    # Optimized lineup (what the engine thinks you *should* start)
-    optimized_assignments, bench_after_opt = optimize_lineup(roster, slots)
-    optimized_starters_players = [
-        a.player for a in optimized_assignments if a.player is not None
-    ]
-    optimized_total_points = sum(p.projection for p in optimized_starters_players)
-
-    # Stash = non-starters who are injured / bye / 0-proj
+    # One pass over the roster splits it into:
+    #  - base (ESPN) starters from your current lineup
+    #  - stash = non-starters who are injured / bye / 0-proj
+    #  - bench to display = current bench minus stash
+    # and caches each player's upper-cased status for the loops below (interned,
+    # so the many status-set lookups hit on identity).
+    base_starters_players: List[Player] = []
     stash_players: List[Player] = []
+    bench_display: List[Player] = []
     for p in roster:
+        status_u = p._status_cached = sys.intern((p.status or "").upper())
         if p.is_starter:
-            continue
-        if _status(p) in STASH_STATUSES or p.projection <= 0:
+            base_starters_players.append(p)
+        elif status_u in STASH_STATUSES or p.projection <= 0:
             stash_players.append(p)
+        else:
+            bench_display.append(p)
+    base_total_points = math.fsum(p.projection for p in base_starters_players)
 
-    # Bench to display = current bench minus stash
-    bench_display = [
-        p for p in roster if (not p.is_starter) and p not in stash_players
-    ]
+    # Optimized lineup (what the engine thinks you *should* start)
+    optimized_assignments, bench_after_opt = optimize_lineup(roster, slots)
+    optimized_total_points = math.fsum(
+        a.player.projection for a in optimized_assignments if a.player is not None
+    )
 
-    bench_swaps_raw = suggest_bench_start_swaps(roster, slots)
-    fa_starter_upgrades_raw = suggest_fa_starter_upgrades(roster, slots, free_agents)
-    fa_bench_upgrades_raw = suggest_fa_bench_upgrades(roster, free_agents)
+    bench_swaps_raw = suggest_bench_start_swaps(
+        roster, slots, optimal_assignments=optimized_assignments
+    )
+    usable_fas = _usable_free_agents(free_agents)
+    fa_starter_upgrades_raw = suggest_fa_starter_upgrades(
+        roster, slots, usable_fas, base_assignments=optimized_assignments
+    )
+    fa_bench_upgrades_raw = suggest_fa_bench_upgrades(roster, usable_fas)
 
     # Build JSON-friendly structure expected by app.py
     # current_starters = your actual ESPN lineup
@@ -754,6 +914,14 @@ def print_lineup_report(team_key: str) -> None:
 if __name__ == "__main__":
     import argparse
     import json
+    import logging
+
+    # Modules log through logging.getLogger(__name__). Set
+    # LINEUPIQ_LOG_LEVEL=WARNING to silence the routine load messages.
+    logging.basicConfig(
+        level=os.environ.get("LINEUPIQ_LOG_LEVEL", "INFO").upper(),
+        format="%(message)s",
+    )
 
     parser = argparse.ArgumentParser(
         description="LineupIQ: optimize lineups for one of your fantasy teams."
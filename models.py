@@ -1,27 +1,55 @@
 # models.py
 
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Dict, List, Optional
 
-@dataclass
+class Position(StrEnum):
+    """
+    Fantasy positions we project and optimize. Members are str subclasses,
+    so they compare equal to (and serialize as) the plain strings used
+    throughout the report and API code.
+    """
+    QB = "QB"
+    RB = "RB"
+    WR = "WR"
+    TE = "TE"
+    K = "K"
+    DST = "DST"
+
+    @classmethod
+    def from_str(cls, raw: str) -> Optional["Position"]:
+        """ESPN position string ('QB', 'D/ST', ...) -> member, or None if unknown."""
+        return _POSITION_BY_ESPN.get(raw)
+
+_POSITION_BY_ESPN: Dict[str, Position] = {p.value: p for p in Position}
+_POSITION_BY_ESPN["D/ST"] = Position.DST
+
+@dataclass(slots=True)
 class Player:
     name: str
     position: str            # QB, RB, WR, TE, DST, K
     projection: float        # this week's projected points
     status: str = "ACTIVE"   # ACTIVE, Q, O, BYE, IR, D
     is_starter: bool = False # your current ESPN lineup flag
+    # Raw ESPN lineup slot code (e.g. "RB/WR/TE" for FLEX), when known.
+    espn_slot: str = field(default="", compare=False)
+    # Upper-cased status, filled in by lineup_report before optimizing.
+    _status_cached: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
-@dataclass
+@dataclass(slots=True)
 class Slot:
     name: str
     eligible_positions: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class Assignment:
     slot: Slot
     player: Optional[Player]
 
-@dataclass
+@dataclass(slots=True)
 class FreeAgent:
     name: str
     position: str
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import functools
+import os
+import logging
+import re
+import sys
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Tuple
 
+import lxml.html  # type: ignore[import]
+import orjson  # type: ignore[import]
 import pandas as pd # type: ignore[import]
 
 from config import CURRENT_WEEK, SCORING, DATA_ROOT, SEASON_YEAR  # type: ignore[import]
 from fetch_fp_projections import main as fetch_fp_main  # type: ignore[import]
 
+log = logging.getLogger(__name__)
+
 def week_folder(week: Optional[int] = None,
                 scoring: Optional[str] = None) -> str:
     """
@@ -24,8 +35,25 @@ def week_folder(week: Optional[int] = None,
     return f"fp_week{week}_{SEASON_YEAR}_{scoring}"
 
 
-# In-memory cache: { folder_path_str : { position: { norm_name: fpts } } }
-_FP_CACHE: Dict[str, Dict[str, Dict[str, float]]] = {}
+# In-memory cache:
+#   { folder_path_str : (folder_mtime, { position: { norm_name: fpts } },
+#                        { (position, norm_name): fpts }) }
+# The folder mtime moves when a file is created, removed or renamed in it
+# (fetch_fp_projections writes each download to a temp file and os.replace()s
+# it into place for this reason), so one stat() tells us whether a cached
+# entry is still current. A file overwritten in place does NOT move it.
+# The last item is the same tables flattened for single-probe lookups.
+_FP_CACHE: Dict[
+    str,
+    Tuple[Optional[float], Dict[str, Dict[str, float]], Dict[Tuple[str, str], float]],
+] = {}
+
+
+def _folder_mtime(folder_path: Path) -> Optional[float]:
+    try:
+        return folder_path.stat().st_mtime
+    except OSError:
+        return None
 
 
 def _norm_name(raw: str) -> str:
@@ -46,23 +74,129 @@ def _norm_name(raw: str) -> str:
     """
     if not isinstance(raw, str):
         return ""
+    return _norm_name_cached(raw)
+
 
-    # Drop anything in parentheses, e.g. "Jordan Love (GB)"
-    if "(" in raw:
-        raw = raw.split("(", 1)[0]
+# Generational / name suffixes, lower-cased with trailing dots removed.
+_SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv", "v"})
 
-    parts = raw.split()
+
+# The same names come through on every load and every ESPN lookup, and the
+# result only depends on the string, so it's memoized.
+@functools.lru_cache(maxsize=8192)
+def _norm_name_cached(raw: str) -> str:
+    # Drop anything in parentheses, e.g. "Jordan Love (GB)", and tokenize.
+    parts = raw.partition("(")[0].split()
 
     # If there is a trailing TEAM code (two or three caps) drop it.
     if parts and parts[-1].isupper() and 2 <= len(parts[-1]) <= 3:
-        parts = parts[:-1]
+        del parts[-1]
 
     # Drop common generational / name suffixes at the very end.
-    SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v", "jr.", "sr."}
-    while parts and parts[-1].rstrip(".").lower() in SUFFIXES:
-        parts = parts[:-1]
+    while parts:
+        last = parts[-1]
+        if last.endswith("."):
+            last = last.rstrip(".")
+        if last.lower() not in _SUFFIXES:
+            break
+        del parts[-1]
+
+    # split() already dropped surrounding whitespace, so no strip() needed.
+    # Interned so FantasyPros keys and normalised ESPN names are the same
+    # object and dict lookups hit on the identity check.
+    return sys.intern(" ".join(parts).lower())
+
+
+# Same whitespace clean-up read_html applies to cell text.
+_CELL_WHITESPACE_RE = re.compile(r"[\r\n]+|\s{2,}")
+
+# Cell texts read_html turns into NaN.
+_NA_CELLS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+})
+
+
+def _cell_text(cell) -> str:
+    return _CELL_WHITESPACE_RE.sub(" ", cell.text_content()).strip()
+
+
+def _read_player_fpts_columns(path: Path):
+    """
+    Pull just the Player and FPTS cells out of the first table with lxml,
+    skipping read_html's DataFrame construction.
+
+    Returns (player_header, fpts_header, player_cells, fpts_cells), or None
+    whenever the table has anything this simple reader doesn't model
+    (row/col spans in the data, hidden elements, nested tables, ...) so
+    the caller can fall back to read_html.
+    """
+    try:
+        root = lxml.html.parse(str(path), lxml.html.HTMLParser(recover=True)).getroot()
+    except Exception:
+        return None
+    if root is None:
+        return None
+
+    # read_html's table choice: the first non-hidden table with any text.
+    table = None
+    for candidate in root.iter("table"):
+        if "display:none" in candidate.get("style", "").replace(" ", ""):
+            continue
+        if any(text.strip("\n") for text in candidate.itertext()):
+            table = candidate
+            break
+    if table is None:
+        return None
+    if table.xpath(".//table|.//style|.//*[@rowspan]"):
+        return None
+    if any(
+        "display:none" in el.get("style", "").replace(" ", "")
+        for el in table.xpath(".//*[@style]")
+    ):
+        return None
+
+    for br in table.iter("br"):
+        br.tail = "\n" + (br.tail or "")
 
-    return " ".join(parts).strip().lower()
+    theads = table.xpath(".//thead")
+    if theads:
+        if any(thead.xpath("./td|./th") for thead in theads):
+            return None
+        header_rows = [tr for thead in theads for tr in thead.xpath("./tr")]
+        body_rows = table.xpath(".//tbody//tr") + table.xpath("./tr")
+    else:
+        body_rows = table.xpath(".//tbody//tr") + table.xpath("./tr")
+        header_rows = []
+        while body_rows and all(c.tag == "th" for c in body_rows[0].xpath("./td|./th")):
+            header_rows.append(body_rows.pop(0))
+    body_rows += table.xpath(".//tfoot//tr")
+    if not header_rows:
+        return None
+
+    # Only the bottom header row names the columns we look for, so spans
+    # in the rows above it are harmless; anywhere else they'd shift cells.
+    header = header_rows[-1].xpath("./td|./th")
+    body = [tr.xpath("./td|./th") for tr in body_rows]
+    for cells in [header, *body]:
+        if any(c.get("colspan", "1") != "1" for c in cells):
+            return None
+
+    header_text = [_cell_text(c) for c in header]
+    lowered = [h.lower() for h in header_text]
+    if "player" not in lowered or "fpts" not in lowered:
+        return None
+    player_idx = lowered.index("player")
+    fpts_idx = lowered.index("fpts")
+
+    player_cells = []
+    fpts_cells = []
+    for cells in body:
+        player_cells.append(_cell_text(cells[player_idx]) if player_idx < len(cells) else "")
+        fpts_cells.append(_cell_text(cells[fpts_idx]) if fpts_idx < len(cells) else "")
+
+    return header_text[player_idx], header_text[fpts_idx], player_cells, fpts_cells
 
 
 def _load_position_file(path: Path, pos: str) -> Dict[str, float]:
@@ -73,99 +207,176 @@ def _load_position_file(path: Path, pos: str) -> Dict[str, float]:
     like ('Unnamed: 0_level_0', 'Player').
     """
     if not path.exists():
-        print(f"[FantasyPros] WARNING: file not found for {pos}: {path}")
+        log.warning("[FantasyPros] WARNING: file not found for %s: %s", pos, path)
         return {}
 
+    columns = _read_player_fpts_columns(path)
+    if columns is not None:
+        player_col, fpts_col, player_cells, fpts_cells = columns
+        log.info(
+            "[FantasyPros] %s: loaded %d rows from %s (player_col=%s, fpts_col=%s)",
+            pos, len(player_cells), path.name, player_col, fpts_col,
+        )
+        # Convert the whole FPTS column in one go; anything non-numeric
+        # (e.g. "BYE", "-", "") comes back as NaN and is skipped below.
+        # Strip thousands separators first, as read_html(thousands=",") does.
+        fpts_cells = [c.replace(",", "") for c in fpts_cells]
+        fpts_values = (
+            pd.to_numeric(pd.Series(fpts_cells, dtype=object), errors="coerce")
+            .astype("float64")
+            .tolist()
+        )
+        out: Dict[str, float] = {}
+        for player_cell, fpts in zip(player_cells, fpts_values):
+            if fpts != fpts:
+                continue
+            name = "" if player_cell in _NA_CELLS else _norm_name(player_cell)
+            if not name:
+                continue
+            prev = out.get(name)
+            if prev is None or fpts > prev:
+                out[name] = fpts
+        return out
+
     # These .xls downloads are actually HTML tables; read_html copes better.
     tables = pd.read_html(path)
     if not tables:
-        print(f"[FantasyPros] WARNING: no tables found in {path}")
+        log.warning("[FantasyPros] WARNING: no tables found in %s", path)
         return {}
 
     df = tables[0]
 
-    # Find a column that looks like "Player"
-    player_col = None
-    for col in df.columns:
-        if isinstance(col, tuple):
-            if str(col[-1]).strip().lower() == "player":
-                player_col = col
-                break
-        else:
-            if str(col).strip().lower() == "player":
-                player_col = col
-                break
-
-    # Find a column that looks like "FPTS"
-    fpts_col = None
-    for col in df.columns:
-        if isinstance(col, tuple):
-            if str(col[-1]).strip().upper() == "FPTS":
-                fpts_col = col
-                break
-        else:
-            if str(col).strip().upper() == "FPTS":
-                fpts_col = col
-                break
+    # Match on the bottom-level header (plain columns and MultiIndex alike),
+    # taking the first column for any repeated name.
+    headers = df.columns.get_level_values(-1).astype(str).str.strip().str.lower()
+    player_hits = headers == "player"
+    fpts_hits = headers == "fpts"
+    player_col = df.columns[player_hits.argmax()] if player_hits.any() else None
+    fpts_col = df.columns[fpts_hits.argmax()] if fpts_hits.any() else None
 
     if player_col is None or fpts_col is None:
-        print(f"[FantasyPros] WARNING: could not find Player/FPTS columns in {path}")
+        log.warning("[FantasyPros] WARNING: could not find Player/FPTS columns in %s", path)
         return {}
 
-    print(
-        f"[FantasyPros] {pos}: loaded {len(df)} rows from {path.name} "
-        f"(player_col={player_col}, fpts_col={fpts_col})"
+    log.info(
+        "[FantasyPros] %s: loaded %d rows from %s (player_col=%s, fpts_col=%s)",
+        pos, len(df), path.name, player_col, fpts_col,
     )
 
-    out: Dict[str, float] = {}
-    for _, row in df.iterrows():
-        name_raw = row[player_col]
+    # Column-wise: rows whose FPTS isn't numeric (e.g. "BYE") or whose name
+    # normalises to nothing are dropped, and duplicate names keep the max
+    # projection (in first-seen order).
+    fpts = pd.to_numeric(df[fpts_col], errors="coerce")
+    names = df[player_col].map(_norm_name)
+    mask = fpts.notna() & (names != "")
+    out = fpts[mask].groupby(names[mask], sort=False).max().to_dict()
+
+    return out
+
+
+# Parsed projections are saved as JSON next to the .xls files so a fresh
+# process can skip the HTML parsing entirely. JSON rather than pickle: loading
+# it cannot run code, whoever can write the data directory.
+_SIDECAR_NAME = "_cache.json"
+
+
+def _read_sidecar(
+    folder_path: Path, files: Dict[str, str]
+) -> Optional[Dict[str, Dict[str, float]]]:
+    """
+    Return the saved pos_maps for this folder, or None if there is no
+    usable sidecar or any of the .xls files is newer than it.
+    """
+    sidecar = folder_path / _SIDECAR_NAME
+    try:
+        cached_mtime = sidecar.stat().st_mtime
+    except OSError:
+        return None
+
+    xls_mtimes = []
+    for filename in files.values():
         try:
-            fpts_raw = float(row[fpts_col])
-        except Exception:
+            xls_mtimes.append((folder_path / filename).stat().st_mtime)
+        except OSError:
             continue
+    if not xls_mtimes or cached_mtime < max(xls_mtimes):
+        return None
 
-        name_norm = _norm_name(name_raw)
-        if not name_norm:
-            continue
+    try:
+        pos_maps = orjson.loads(sidecar.read_bytes())
+    except (OSError, orjson.JSONDecodeError) as exc:
+        log.warning("[FantasyPros] WARNING: ignoring unreadable %s: %s", sidecar, exc)
+        return None
+
+    if not isinstance(pos_maps, dict) or not all(
+        isinstance(pos_map, dict)
+        and all(
+            isinstance(fpts, (int, float)) and not isinstance(fpts, bool)
+            for fpts in pos_map.values()
+        )
+        for pos_map in pos_maps.values()
+    ):
+        log.warning("[FantasyPros] WARNING: ignoring malformed %s", sidecar)
+        return None
+    # Decoded keys are fresh strings; re-intern them like _norm_name does.
+    return {
+        pos: {sys.intern(name): float(fpts) for name, fpts in pos_map.items()}
+        for pos, pos_map in pos_maps.items()
+    }
 
-        # Keep the max projection if duplicates exist.
-        prev = out.get(name_norm)
-        if prev is None or fpts_raw > prev:
-            out[name_norm] = fpts_raw
 
-    return out
+def _write_sidecar(folder_path: Path, pos_maps: Dict[str, Dict[str, float]]) -> None:
+    sidecar = folder_path / _SIDECAR_NAME
+    tmp = sidecar.with_suffix(".tmp")
+    try:
+        tmp.write_bytes(orjson.dumps(pos_maps, option=orjson.OPT_SERIALIZE_NUMPY))
+        # Atomic swap so a concurrent reader never sees a half-written file.
+        os.replace(tmp, sidecar)
+    except OSError as exc:
+        log.warning("[FantasyPros] WARNING: could not write %s: %s", sidecar, exc)
 
 
 def _ensure_loaded(scoring: Optional[str] = None) -> Dict[str, Dict[str, float]]:
     """
     Ensure projections are loaded for the current week / scoring.
 
-    Returns: { position: {norm_name: fpts} }
+    Returns: { position: {norm_name: fpts} }, plus the squashed DST index
+    under _DST_SQUASHED.
     """
+    return _ensure_tables(scoring)[0]
+
+
+def _ensure_tables(
+    scoring: Optional[str] = None,
+) -> Tuple[Dict[str, Dict[str, float]], Dict[Tuple[str, str], float]]:
+    """_ensure_loaded, also returning the flat {(position, norm_name): fpts} view."""
     if scoring is None:
         scoring = SCORING
 
     folder_name = week_folder(CURRENT_WEEK, scoring)
     folder_path = Path(DATA_ROOT) / folder_name
-    key = str(folder_path.resolve())
+    # The folder is fully determined by (DATA_ROOT, week, scoring), so the
+    # plain path string is a good enough key; resolve() would hit the disk.
+    key = str(folder_path)
 
-    if key in _FP_CACHE:
-        return _FP_CACHE[key]
+    entry = _FP_CACHE.get(key)
+    if entry is not None and entry[0] == _folder_mtime(folder_path):
+        return entry[1], entry[2]
 
     # If the expected week/scoring folder is empty, automatically download
     # the latest FantasyPros projections for this week.
     if not folder_path.exists() or not any(folder_path.iterdir()):
-        print(
-            f"[FantasyPros] No projection files found for {folder_name}; "
-            f"invoking fetch_fp_projections.main() to download them..."
+        log.info(
+            "[FantasyPros] No projection files found for %s; "
+            "invoking fetch_fp_projections.main() to download them...",
+            folder_name,
         )
         try:
             fetch_fp_main()
         except Exception as exc:  # pragma: no cover - defensive
-            print(f"[FantasyPros] ERROR downloading projections: {exc}")
+            log.error("[FantasyPros] ERROR downloading projections: %s", exc)
 
-    print(f"[FantasyPros] Using folder layout: {folder_path}")
+    log.info("[FantasyPros] Using folder layout: %s", folder_path)
     folder_path.mkdir(parents=True, exist_ok=True)
 
     files = {
@@ -177,51 +388,189 @@ def _ensure_loaded(scoring: Optional[str] = None) -> Dict[str, Dict[str, float]]
         "DST": "dst.xls",
     }
 
-    pos_maps: Dict[str, Dict[str, float]] = {}
-    total_rows = 0
+    cached = _read_sidecar(folder_path, files)
+    if cached is not None:
+        _add_dst_index(cached)
+        flat = _flatten(cached, files)
+        _FP_CACHE[key] = (_folder_mtime(folder_path), cached, flat)
+        log.info(
+            "[FantasyPros] Loaded %d projection entries from %s "
+            "for week %s (scoring=%s).",
+            len(flat), _SIDECAR_NAME, CURRENT_WEEK, scoring,
+        )
+        return cached, flat
+
+    # Parsing the six HTML files is independent work (and lxml releases the
+    # GIL while it parses), so load them in parallel.
+    with ThreadPoolExecutor(max_workers=len(files)) as pool:
+        loaded = pool.map(
+            lambda item: _load_position_file(folder_path / item[1], item[0]),
+            files.items(),
+        )
+        pos_maps: Dict[str, Dict[str, float]] = dict(zip(files, loaded))
+    total_rows = sum(len(pos_map) for pos_map in pos_maps.values())
+
+    # Written before taking the folder mtime, since creating the sidecar
+    # bumps it, and before adding the DST index, which is rebuilt on load.
+    _write_sidecar(folder_path, pos_maps)
+    _add_dst_index(pos_maps)
+    flat = _flatten(pos_maps, files)
+    _FP_CACHE[key] = (_folder_mtime(folder_path), pos_maps, flat)
+    log.info(
+        "[FantasyPros] Loaded %d projection entries for week %s (scoring=%s).",
+        total_rows, CURRENT_WEEK, scoring,
+    )
 
-    for pos, filename in files.items():
-        path = folder_path / filename
-        pos_map = _load_position_file(path, pos)
-        pos_maps[pos] = pos_map
-        total_rows += len(pos_map)
+    return pos_maps, flat
 
-    _FP_CACHE[key] = pos_maps
-    print(
-        f"[FantasyPros] Loaded {total_rows} projection entries "
-        f"for week {CURRENT_WEEK} (scoring={scoring})."
-    )
 
-    return pos_maps
+def _flatten(
+    pos_maps: Dict[str, Dict[str, float]], positions: Iterable[str]
+) -> Dict[Tuple[str, str], float]:
+    return {
+        (pos, name): fpts
+        for pos in positions
+        for name, fpts in pos_maps.get(pos, {}).items()
+    }
 
 
 def get_fp_projection_for_espn_player(
     espn_player_name: str,
     position: str,
     team_cfg: Optional[dict] = None,
+    *,
+    norm_name: Optional[str] = None,
 ) -> Optional[float]:
     """
     Lookup a projection for an ESPN player using FantasyPros tables.
 
     espn_player_name: name from ESPN API (e.g. 'Jordan Love')
     position: 'QB', 'RB', 'WR', 'TE', 'K', 'DST'
-    team_cfg: a team dict from config.TEAMS; we currently only care about
+    team_cfg: a team config from config.TEAMS; we currently only care about
               the 'scoring' field if present.
+    norm_name: espn_player_name already run through _norm_name, for callers
+               that probe the same player repeatedly; skips re-normalising.
+    """
+    return _lookup_in_table(
+        _pos_maps_for(team_cfg), _pos_key(position), espn_player_name, norm_name
+    )
+
+
+def get_fp_projections_bulk(
+    players: Iterable[Tuple[str, str]],
+    team_cfg: Optional[dict] = None,
+) -> Dict[Tuple[str, str], Optional[float]]:
+    """
+    Lookup projections for many (espn_player_name, position) pairs at once;
+    the projection tables are resolved once for the whole batch instead of
+    once per player. Returns {(name, position): projection or None}.
+    """
+    pos_maps, flat = _ensure_tables(_scoring_for(team_cfg))
+    out: Dict[Tuple[str, str], Optional[float]] = {}
+    # A roster only has a handful of distinct position strings, so each is
+    # normalised to its table key once per batch rather than once per player.
+    pos_keys: Dict[str, str] = {}
+    for name, position in players:
+        if (name, position) in out:
+            continue
+        pos = pos_keys.get(position)
+        if pos is None:
+            pos = pos_keys[position] = _pos_key(position)
+        value = flat.get((pos, _norm_name(name)))
+        if value is None and pos == "DST":
+            value = _match_dst(pos_maps, name)
+        out[(name, position)] = value
+    return out
+
+
+def get_fp_projection_fast(
+    pos: str,
+    norm_name: str,
+    team_cfg: Optional[dict] = None,
+) -> Optional[float]:
+    """
+    Single-probe lookup for callers that already hold the table key
+    ('QB', 'RB', 'WR', 'TE', 'K', 'DST') and a _norm_name'd player name.
+    Exact matches only: no position aliasing and no DST fuzzy fallback.
     """
-    scoring = None
-    if isinstance(team_cfg, dict):
-        scoring = team_cfg.get("scoring")
+    return _ensure_tables(_scoring_for(team_cfg))[1].get((pos, norm_name))
 
-    pos_maps = _ensure_loaded(scoring=scoring)
 
+def _pos_maps_for(team_cfg: Optional[dict]) -> Dict[str, Dict[str, float]]:
+    return _ensure_loaded(scoring=_scoring_for(team_cfg))
+
+
+def _scoring_for(team_cfg: Optional[dict]) -> Optional[str]:
+    if isinstance(team_cfg, Mapping):
+        return team_cfg.get("scoring")
+    return None
+
+
+# For ASCII input: keep letters (lower-cased) and delete everything else.
+_SQUASH_TABLE = {c: None for c in range(128) if not chr(c).isalpha()}
+_SQUASH_TABLE.update({c: c + 32 for c in range(ord("A"), ord("Z") + 1)})
+
+
+@functools.lru_cache(maxsize=1024)
+def _squash_team(s: str) -> str:
+    """Team name reduced to lower-case letters, minus generic defense tokens."""
+    s = str(s)
+    if s.isascii():
+        only_letters = s.translate(_SQUASH_TABLE)
+    else:
+        # Unicode letters/case mapping: take the slow, exact path.
+        only_letters = "".join(ch.lower() for ch in s if ch.isalpha())
+    # Sequential on purpose: removing "dst" can expose a "def".
+    for token in ("dst", "defense", "def"):
+        only_letters = only_letters.replace(token, "")
+    return only_letters
+
+
+# pos_maps entry holding the DST table with its keys already squashed, so
+# the fuzzy fallback doesn't re-squash every team name on every lookup.
+_DST_SQUASHED = "__DST_SQUASHED__"
+
+
+def _add_dst_index(pos_maps: Dict[str, Dict[str, float]]) -> None:
+    squashed: Dict[str, float] = {}
+    for key, fpts in pos_maps.get("DST", {}).items():
+        k = _squash_team(key)
+        # Keep the first hit for a squashed name: the fallback below
+        # returns the first match in table order.
+        if k and k not in squashed:
+            squashed[k] = fpts
+    pos_maps[_DST_SQUASHED] = squashed
+
+
+# Exact ESPN position strings -> pos_maps key; anything else is upper-cased.
+_POS_ALIAS = {
+    "QB": "QB",
+    "RB": "RB",
+    "WR": "WR",
+    "TE": "TE",
+    "K": "K",
+    "DST": "DST",
+    "D/ST": "DST",
+    "DEF": "DST",
+}
+
+
+def _pos_key(position: str) -> str:
     # Some positions in ESPN are like 'D/ST'; normalise to 'DST'.
-    if position in ("D/ST", "DST", "DEF"):
-        position = "DST"
+    return _POS_ALIAS.get(position) or position.upper()
+
 
+def _lookup_in_table(
+    pos_maps: Dict[str, Dict[str, float]],
+    pos: str,
+    espn_player_name: str,
+    norm: Optional[str] = None,
+) -> Optional[float]:
     # Normalise the name in the same way we normalised FP names.
-    norm = _norm_name(espn_player_name)
+    if norm is None:
+        norm = _norm_name(espn_player_name)
 
-    pos_map = pos_maps.get(position.upper())
+    pos_map = pos_maps.get(pos)
     if not pos_map:
         return None
 
@@ -230,26 +579,29 @@ def get_fp_projection_for_espn_player(
     if value is not None:
         return value
 
+    if pos == "DST":
+        return _match_dst(pos_maps, espn_player_name)
+
+    return None
+
+
+def _match_dst(
+    pos_maps: Dict[str, Dict[str, float]],
+    espn_player_name: str,
+) -> Optional[float]:
     # DST naming between ESPN and FantasyPros can be quite different
     # (e.g. "Seahawks D/ST" vs "Seattle Seahawks"). As a fallback, for DST
     # we do a fuzzy-ish match that strips non-letters and generic defense
     # suffixes and then looks for overlapping team names.
-    if position.upper() == "DST":
-        def _squash_team(s: str) -> str:
-            only_letters = "".join(ch.lower() for ch in str(s) if ch.isalpha())
-            for token in ("dst", "defense", "def"):
-                only_letters = only_letters.replace(token, "")
-            return only_letters
-
-        target = _squash_team(espn_player_name)
-        if not target:
-            return None
+    target = _squash_team(espn_player_name)
+    if not target:
+        return None
 
-        for key, fpts in pos_map.items():
-            k = _squash_team(key)
-            if not k:
-                continue
-            if k in target or target in k:
-                return fpts
+    # Only the shorter string can be inside the other, so each
+    # candidate needs just one substring test.
+    target_len = len(target)
+    for k, fpts in pos_maps.get(_DST_SQUASHED, {}).items():
+        if (k in target) if len(k) <= target_len else (target in k):
+            return fpts
 
     return None